@@ -2,7 +2,8 @@
 """
 Run all DH experiments for Grim Fairy Tale analysis.
 
-This script executes all four experiments in sequence:
+This script executes all four experiments concurrently, one worker
+process per experiment:
 1. Structural Alignment (film vs game comparison)
 2. Narrative Density Heatmap (spatial storytelling)
 3. Semantic Network Analysis (entity-theme co-occurrence)
@@ -10,6 +11,10 @@ This script executes all four experiments in sequence:
 
 Usage:
     python run_all_experiments.py
+    NX_BACKEND=networkit python run_all_experiments.py  # or igraph
+
+NX_BACKEND selects a C++-backed library for the Experiment 3 community
+detection; NetworkX/python-louvain is used when unset or not installed.
 
 All outputs are saved to:
     outputs/figures/  - PNG (300 DPI) and PDF figures
@@ -17,20 +22,31 @@ All outputs are saved to:
     outputs/metrics/  - JSON metrics files
 """
 
+import io
 import sys
 import os
 import time
+import importlib
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+# Non-interactive backend so worker processes never contend on a GUI backend
+import matplotlib
+matplotlib.use('Agg')
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from src.experiment_1_alignment import StructuralAlignment
-from src.experiment_2_density import NarrativeDensity
-from src.experiment_3_network import SemanticNetwork
-from src.experiment_4_motif import MotifEvolution
-from src.parsers import EventDumpParser, NarrativeExtractionParser
+# Experiments are independent and write to disjoint output files:
+# (result key, module under src/, analyzer class)
+EXPERIMENTS = [
+    ('exp1', 'experiment_1_alignment', 'StructuralAlignment'),
+    ('exp2', 'experiment_2_density', 'NarrativeDensity'),
+    ('exp3', 'experiment_3_network', 'SemanticNetwork'),
+    ('exp4', 'experiment_4_motif', 'MotifEvolution'),
+]
 
 
 def print_header():
@@ -42,6 +58,7 @@ def print_header():
     print("╚" + "═"*78 + "╝")
     print()
     print(f"  Analysis started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  Network backend:  {os.environ.get('NX_BACKEND') or 'networkx'}")
     print()
 
 
@@ -104,6 +121,16 @@ def print_footer(results: dict, duration: float):
     print()
 
 
+@contextmanager
+def buffered_stdout():
+    """Collect everything printed in the block and write it in one call."""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        yield
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+
+
 def ensure_directories():
     """Create output directories if they don't exist."""
     dirs = [
@@ -118,16 +145,20 @@ def ensure_directories():
 def verify_data_files():
     """Verify that required data files exist."""
     required_files = [
-        'data/EventTextDump.txt',
-        'data/narrative_extraction.md',
-        'data/ballad_of_soldier_beats.json',
-        'data/context_keywords.json'
+        'EventTextDump.txt',
+        'narrative_extraction.md',
+        'ballad_of_soldier_beats.json',
+        'context_keywords.json'
     ]
     
-    missing = []
-    for f in required_files:
-        if not Path(f).exists():
-            missing.append(f)
+    # One directory listing instead of a stat() per file
+    try:
+        with os.scandir('data') as entries:
+            present = {e.name for e in entries}
+    except FileNotFoundError:
+        present = set()
+    
+    missing = [f'data/{f}' for f in required_files if f not in present]
     
     if missing:
         print("ERROR: Missing required data files:")
@@ -138,11 +169,27 @@ def verify_data_files():
         sys.exit(1)
 
 
+def run_experiment(module_name: str, class_name: str) -> dict:
+    """
+    Run a single experiment in the current (worker) process.
+    
+    Args:
+        module_name: Experiment module name under src/
+        class_name: Analyzer class to instantiate
+        
+    Returns:
+        Results dictionary from the experiment's run()
+    """
+    module = importlib.import_module(f'src.{module_name}')
+    return getattr(module, class_name)().run()
+
+
 def main():
     """Run all experiments."""
     start_time = time.time()
     
-    print_header()
+    with buffered_stdout():
+        print_header()
     
     # Setup
     ensure_directories()
@@ -151,54 +198,28 @@ def main():
     results = {}
     
     # =========================================================================
-    # Experiment 1: Structural Alignment
-    # =========================================================================
-    print("\n" + "─"*80)
-    try:
-        exp1 = StructuralAlignment()
-        results['exp1'] = exp1.run()
-    except Exception as e:
-        print(f"ERROR in Experiment 1: {e}")
-        results['exp1'] = {'error': str(e)}
-    
-    # =========================================================================
-    # Experiment 2: Narrative Density
-    # =========================================================================
-    print("\n" + "─"*80)
-    try:
-        exp2 = NarrativeDensity()
-        results['exp2'] = exp2.run()
-    except Exception as e:
-        print(f"ERROR in Experiment 2: {e}")
-        results['exp2'] = {'error': str(e)}
-    
-    # =========================================================================
-    # Experiment 3: Semantic Network
+    # Experiments 1-4: run concurrently, collect results as they complete
     # =========================================================================
-    print("\n" + "─"*80)
-    try:
-        exp3 = SemanticNetwork()
-        results['exp3'] = exp3.run()
-    except Exception as e:
-        print(f"ERROR in Experiment 3: {e}")
-        results['exp3'] = {'error': str(e)}
-    
-    # =========================================================================
-    # Experiment 4: Motif Evolution
-    # =========================================================================
-    print("\n" + "─"*80)
-    try:
-        exp4 = MotifEvolution()
-        results['exp4'] = exp4.run()
-    except Exception as e:
-        print(f"ERROR in Experiment 4: {e}")
-        results['exp4'] = {'error': str(e)}
+    max_workers = min(len(EXPERIMENTS), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_experiment, module_name, class_name): key
+            for key, module_name, class_name in EXPERIMENTS
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                print(f"ERROR in Experiment {key[-1]}: {e}")
+                results[key] = {'error': str(e)}
     
     # =========================================================================
     # Summary
     # =========================================================================
     duration = time.time() - start_time
-    print_footer(results, duration)
+    with buffered_stdout():
+        print_footer(results, duration)
     
     return results
 
@@ -16,13 +16,20 @@ Method:
 4. Calculate alignment score and visualize correspondences
 """
 
+import io
+import re
+import sys
 import json
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Figures are only written to disk; safe to save off-thread
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Tuple, Optional
-from collections import defaultdict
 
 from .visualization import (
     create_figure, save_figure, add_source_annotation,
@@ -32,6 +39,60 @@ from .visualization import (
 from .parsers import load_json_data, save_json_data
 
 
+# Key terms whose presence in both film and game descriptions marks a
+# direct transposition rather than a structural homology
+_OVERLAP_WORDS = (
+    'kill', 'tank', 'wolf', 'werewolf', 'visit', 'mother',
+    'grandmother', 'leave', 'return', 'soap', 'letter',
+    'deliver', 'promise', 'train', 'journey', 'delay'
+)
+_OVERLAP_RE = re.compile(r'\b(?:' + '|'.join(_OVERLAP_WORDS) + r')\b', re.IGNORECASE)
+
+# Beat count above which timeline markers are rasterized in vector output
+_RASTERIZE_MIN_BEATS = 200
+
+# Film timestamps: HH:MM:SS or MM:SS
+_TS_RE = re.compile(r'^(?:(?P<h>\d+):)?(?P<m>\d+):(?P<s>\d+)$')
+
+
+def _timestamp_to_minutes_vec(timestamps: pd.Series) -> pd.Series:
+    """
+    Convert a Series of HH:MM:SS / MM:SS timestamps to minutes.
+    
+    Parses with the same pattern as the scalar _timestamp_to_minutes, so
+    malformed or empty timestamps become 0.0 instead of raising.
+    
+    Args:
+        timestamps: Series of timestamp strings
+        
+    Returns:
+        Series of float minutes
+    """
+    parts = timestamps.str.extract(_TS_RE).astype(float)
+    minutes = parts['h'].fillna(0) * 60 + parts['m'] + parts['s'] / 60
+    return minutes.fillna(0.0)
+
+
+class _StatusLog:
+    """
+    Collects status lines and writes them to stdout in one call per flush.
+    
+    Keeps progress output to a handful of writes per run, which matters
+    when stdout is a pipe shared by several experiment processes.
+    """
+    
+    def __init__(self):
+        self.buf = io.StringIO()
+    
+    def __call__(self, *args):
+        print(*args, file=self.buf)
+    
+    def flush(self):
+        sys.stdout.write(self.buf.getvalue())
+        sys.stdout.flush()
+        self.buf = io.StringIO()
+
+
 class StructuralAlignment:
     """
     Analyze structural alignment between game narrative and film source.
@@ -60,9 +121,15 @@ class StructuralAlignment:
         self.game_beats: List[Dict[str, Any]] = []
         self.alignment_table: Optional[pd.DataFrame] = None
         self.alignment_score: float = 0.0
+        self._metrics: Optional[Dict[str, Any]] = None
+        self._film_df: Optional[pd.DataFrame] = None
+        self._game_df: Optional[pd.DataFrame] = None
         
     def load_data(self):
-        """Load film and game beat data from JSON files."""
+        """Load film and game beat data from JSON files (once per instance)."""
+        if self.film_beats and self.game_beats:
+            return
+        
         # Load film beats
         film_path = self.data_dir / 'ballad_of_soldier_beats.json'
         self.film_beats = load_json_data(str(film_path))
@@ -79,62 +146,52 @@ class StructuralAlignment:
         """
         Match narrative beats between film and game by structural type.
         
+        The n-th film beat of a given type is paired with the n-th game beat
+        of the same type; film beats without a counterpart are unmatched.
+        
         Returns:
-            DataFrame with alignment mappings
+            DataFrame with alignment mappings (computed once per instance)
         """
-        alignment_data = []
-        
-        # Group beats by type
-        film_by_type = defaultdict(list)
-        for fb in self.film_beats:
-            film_by_type[fb['type']].append(fb)
-        
-        game_by_type = defaultdict(list)
-        for gb in self.game_beats:
-            game_by_type[gb['type']].append(gb)
+        if self.alignment_table is not None:
+            return self.alignment_table
+        
+        film_df = pd.DataFrame(self.film_beats, columns=['type', 'timestamp', 'description'])
+        game_df = pd.DataFrame(self.game_beats,
+                               columns=['type', 'map_id', 'event_id', 'line', 'description'])
+        
+        # Occurrence index within each beat type is the pairing key
+        film_df['occ'] = film_df.groupby('type').cumcount()
+        game_df['occ'] = game_df.groupby('type').cumcount()
+        self._film_df, self._game_df = film_df, game_df
+        
+        merged = film_df.merge(game_df, on=['type', 'occ'], how='left', suffixes=('_f', '_g'))
+        matched = merged['description_g'].notna()
+        
+        # Direct transposition when both descriptions share a key term
+        film_terms = merged['description_f'].str.lower().str.findall(_OVERLAP_RE).map(set)
+        game_terms = merged['description_g'].fillna('').str.lower().str.findall(_OVERLAP_RE).map(set)
+        shared = np.array([bool(f & g) for f, g in zip(film_terms, game_terms)], dtype=bool)
+        match_type = np.where(shared, 'Direct Transposition', 'Structural Homology')
+        
+        game_location = (
+            'Map ' + merged['map_id'].astype('Int64').astype(str).str.zfill(3)
+            + ', Event ' + merged['event_id'].astype('Int64').astype(str).str.zfill(3)
+            + ', Line ' + merged['line'].astype('Int64').astype(str)
+        )
         
-        # Find matches
-        for beat_type in film_by_type.keys():
-            film_instances = film_by_type[beat_type]
-            game_instances = game_by_type.get(beat_type, [])
-            
-            for fb in film_instances:
-                if game_instances:
-                    # Match to first available game instance
-                    gb = game_instances[0]
-                    match_type = self._classify_match(fb, gb)
-                    
-                    alignment_data.append({
-                        'Beat Type': beat_type.replace('_', ' ').title(),
-                        'Film Timestamp': fb['timestamp'],
-                        'Film Beat': fb['description'],
-                        'Game Location': f"Map {gb['map_id']:03d}, Event {gb['event_id']:03d}, Line {gb['line']}",
-                        'Game Beat': gb['description'],
-                        'Match Type': match_type,
-                        'Matched': True
-                    })
-                    
-                    # Remove used game instance
-                    game_instances = game_instances[1:]
-                else:
-                    # No matching game beat
-                    alignment_data.append({
-                        'Beat Type': beat_type.replace('_', ' ').title(),
-                        'Film Timestamp': fb['timestamp'],
-                        'Film Beat': fb['description'],
-                        'Game Location': '—',
-                        'Game Beat': '(No match)',
-                        'Match Type': 'Unmatched',
-                        'Matched': False
-                    })
-        
-        self.alignment_table = pd.DataFrame(alignment_data)
+        self.alignment_table = pd.DataFrame({
+            'Beat Type': merged['type'].str.replace('_', ' ').str.title(),
+            'Film Timestamp': merged['timestamp'],
+            'Film Beat': merged['description_f'],
+            'Game Location': game_location.where(matched, '—'),
+            'Game Beat': merged['description_g'].where(matched, '(No match)'),
+            'Match Type': np.where(matched, match_type, 'Unmatched'),
+            'Matched': matched,
+        })
         
         # Sort by film timestamp
-        self.alignment_table['_sort_key'] = self.alignment_table['Film Timestamp'].apply(
-            lambda x: self._timestamp_to_minutes(x)
-        )
-        self.alignment_table = self.alignment_table.sort_values('_sort_key').drop('_sort_key', axis=1)
+        sort_key = _timestamp_to_minutes_vec(merged['timestamp'])
+        self.alignment_table = self.alignment_table.iloc[np.argsort(sort_key.to_numpy(), kind='stable')]
         
         return self.alignment_table
     
@@ -149,20 +206,9 @@ class StructuralAlignment:
         Returns:
             'Direct Transposition' or 'Structural Homology'
         """
-        film_desc = film_beat['description'].lower()
-        game_desc = game_beat['description'].lower()
-        
         # Check for key shared terms
-        film_words = set(film_desc.split())
-        game_words = set(game_desc.split())
-        
-        # Look for strong semantic overlap
-        overlap_words = {'kill', 'tank', 'wolf', 'werewolf', 'visit', 'mother',
-                        'grandmother', 'leave', 'return', 'soap', 'letter',
-                        'deliver', 'promise', 'train', 'journey', 'delay'}
-        
-        film_key = film_words & overlap_words
-        game_key = game_words & overlap_words
+        film_key = set(_OVERLAP_RE.findall(film_beat['description'].lower()))
+        game_key = set(_OVERLAP_RE.findall(game_beat['description'].lower()))
         
         if film_key & game_key:
             return 'Direct Transposition'
@@ -170,15 +216,12 @@ class StructuralAlignment:
             return 'Structural Homology'
     
     def _timestamp_to_minutes(self, timestamp: str) -> float:
-        """Convert HH:MM:SS to minutes."""
-        parts = timestamp.split(':')
-        if len(parts) == 3:
-            h, m, s = int(parts[0]), int(parts[1]), int(parts[2])
-            return h * 60 + m + s / 60
-        elif len(parts) == 2:
-            m, s = int(parts[0]), int(parts[1])
-            return m + s / 60
-        return 0.0
+        """Convert HH:MM:SS (or MM:SS) to minutes."""
+        match = _TS_RE.match(timestamp)
+        if match is None:
+            return 0.0
+        h, m, s = match.group('h', 'm', 's')
+        return int(h or 0) * 60 + int(m) + int(s) / 60
     
     def calculate_alignment_score(self) -> float:
         """
@@ -202,29 +245,37 @@ class StructuralAlignment:
         Get comprehensive alignment metrics.
         
         Returns:
-            Dictionary of alignment metrics
+            Dictionary of alignment metrics (computed once per instance)
         """
+        if self._metrics is not None:
+            return self._metrics
+        
         if self.alignment_table is None:
             self.compute_alignment()
         
         df = self.alignment_table
         
+        # One pass each over the match flags, match types and beat types
+        matched = int(df['Matched'].sum())
+        match_counts = df['Match Type'].value_counts()
+        type_matches = df.groupby('Beat Type')['Matched'].sum()
+        
         metrics = {
             'total_film_beats': len(self.film_beats),
             'total_game_beats': len(self.game_beats),
-            'matched_beats': int(df['Matched'].sum()),
-            'unmatched_beats': int((~df['Matched']).sum()),
+            'matched_beats': matched,
+            'unmatched_beats': len(df) - matched,
             'alignment_score_percent': round(self.calculate_alignment_score(), 2),
-            'direct_transpositions': int((df['Match Type'] == 'Direct Transposition').sum()),
-            'structural_homologies': int((df['Match Type'] == 'Structural Homology').sum()),
-            'beat_types_present': df[df['Matched']]['Beat Type'].nunique(),
-            'total_beat_types': df['Beat Type'].nunique()
+            'direct_transpositions': int(match_counts.get('Direct Transposition', 0)),
+            'structural_homologies': int(match_counts.get('Structural Homology', 0)),
+            'beat_types_present': int((type_matches > 0).sum()),
+            'total_beat_types': len(type_matches)
         }
         
         # Beat type breakdown
-        type_counts = df.groupby('Beat Type')['Matched'].sum().to_dict()
-        metrics['beat_type_matches'] = {k: int(v) for k, v in type_counts.items()}
+        metrics['beat_type_matches'] = {k: int(v) for k, v in type_matches.items()}
         
+        self._metrics = metrics
         return metrics
     
     def plot_timeline_alignment(self) -> plt.Figure:
@@ -242,22 +293,28 @@ class StructuralAlignment:
         if self.alignment_table is None:
             self.compute_alignment()
         
-        fig, ax = plt.subplots(figsize=(14, 6))
+        fig = Figure(figsize=(14, 6))
+        ax = fig.subplots()
         
         # Convert timestamps to positions
         df = self.alignment_table.copy()
-        df['Film Minutes'] = df['Film Timestamp'].apply(self._timestamp_to_minutes)
+        df['Film Minutes'] = _timestamp_to_minutes_vec(df['Film Timestamp'])
         
         # Normalize to 0-1 scale
         max_time = df['Film Minutes'].max()
         df['X Position'] = df['Film Minutes'] / max_time
         
+        # Dense beat sets embed markers/connectors as a raster in the PDF
+        # (text stays vector); small ones are cheaper to keep fully vector
+        rasterize = len(df) > _RASTERIZE_MIN_BEATS
+        
         # Plot film beats (top row, y=1)
         film_x = df['X Position'].values
         film_y = np.ones(len(film_x))
         
         ax.scatter(film_x, film_y, s=150, c=COLORS['direct'], 
-                   marker='s', label='Film Beats', zorder=3, edgecolor='white', linewidth=2)
+                   marker='s', label='Film Beats', zorder=3, edgecolor='white', linewidth=2,
+                   rasterized=rasterize)
         
         # Plot game beats (bottom row, y=0), only matched ones
         matched = df[df['Matched']]
@@ -265,22 +322,27 @@ class StructuralAlignment:
         game_y = np.zeros(len(game_x))
         
         ax.scatter(game_x, game_y, s=150, c=COLORS['structural'], 
-                   marker='o', label='Game Beats', zorder=3, edgecolor='white', linewidth=2)
-        
-        # Draw connecting lines for matches
-        for idx, row in matched.iterrows():
-            x = row['X Position']
-            color = COLORS['direct'] if row['Match Type'] == 'Direct Transposition' else COLORS['structural']
-            linestyle = '-' if row['Match Type'] == 'Direct Transposition' else '--'
-            
-            ax.plot([x, x], [0, 1], color=color, linestyle=linestyle, 
-                    alpha=0.6, linewidth=2, zorder=1)
+                   marker='o', label='Game Beats', zorder=3, edgecolor='white', linewidth=2,
+                   rasterized=rasterize)
+        
+        # Draw connecting lines for matches as one (N, 2, 2) segment collection
+        is_direct = matched['Match Type'].to_numpy() == 'Direct Transposition'
+        segments = np.stack([np.column_stack([game_x, game_y]),
+                             np.column_stack([game_x, np.ones_like(game_x)])], axis=1)
+        connectors = LineCollection(
+            segments,
+            colors=np.where(is_direct, COLORS['direct'], COLORS['structural']).tolist(),
+            linestyles=np.where(is_direct, '-', '--').tolist(),
+            linewidths=2, alpha=0.6, zorder=1,
+            rasterized=rasterize
+        )
+        ax.add_collection(connectors, autolim=False)
         
         # Add beat type labels
-        for idx, row in df.iterrows():
-            beat_type_short = row['Beat Type'][:12] + '...' if len(row['Beat Type']) > 12 else row['Beat Type']
+        for x, beat_type in zip(film_x, df['Beat Type'].to_numpy()):
+            beat_type_short = beat_type[:12] + '...' if len(beat_type) > 12 else beat_type
             ax.annotate(beat_type_short, 
-                       (row['X Position'], 1.1), 
+                       (x, 1.1), 
                        rotation=45, ha='left', va='bottom', fontsize=8)
         
         # Formatting
@@ -313,7 +375,7 @@ class StructuralAlignment:
         
         add_source_annotation(ax, 'Source: narrative_extraction.md analysis')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         return fig
     
@@ -329,25 +391,21 @@ class StructuralAlignment:
         if self.alignment_table is None:
             self.compute_alignment()
         
-        # Count beat types
-        film_types = defaultdict(int)
-        for fb in self.film_beats:
-            film_types[fb['type'].replace('_', ' ').title()] += 1
-        
-        game_types = defaultdict(int)
-        for gb in self.game_beats:
-            game_types[gb['type'].replace('_', ' ').title()] += 1
+        # Count beat types (reusing the frames built by compute_alignment)
+        film_types = self._film_df['type'].str.replace('_', ' ').str.title().value_counts()
+        game_types = self._game_df['type'].str.replace('_', ' ').str.title().value_counts()
         
         # Combine all types
-        all_types = sorted(set(film_types.keys()) | set(game_types.keys()))
+        all_types = sorted(set(film_types.index) | set(game_types.index))
         
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
         
         x = np.arange(len(all_types))
         width = 0.35
         
-        film_counts = [film_types.get(t, 0) for t in all_types]
-        game_counts = [game_types.get(t, 0) for t in all_types]
+        film_counts = film_types.reindex(all_types, fill_value=0).to_numpy()
+        game_counts = game_types.reindex(all_types, fill_value=0).to_numpy()
         
         bars1 = ax.bar(x - width/2, film_counts, width, label='Film', color=COLORS['direct'])
         bars2 = ax.bar(x + width/2, game_counts, width, label='Game', color=COLORS['structural'])
@@ -372,7 +430,7 @@ class StructuralAlignment:
                 ax.annotate(f'{int(height)}', xy=(bar.get_x() + bar.get_width()/2, height),
                            xytext=(0, 3), textcoords="offset points", ha='center', fontsize=9)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         return fig
     
@@ -383,41 +441,52 @@ class StructuralAlignment:
         Returns:
             Dictionary with all results and file paths
         """
-        print("="*60)
-        print("EXPERIMENT 1: Structural Alignment Analysis")
-        print("="*60)
+        log = _StatusLog()
+        
+        log("="*60)
+        log("EXPERIMENT 1: Structural Alignment Analysis")
+        log("="*60)
         
         # Load data
-        print("\n[1/4] Loading data...")
+        log("\n[1/4] Loading data...")
+        log.flush()
         self.load_data()
         
         # Compute alignment
-        print("[2/4] Computing alignment...")
+        log("[2/4] Computing alignment...")
         self.compute_alignment()
         metrics = self.get_metrics()
         
-        print(f"  - Matched {metrics['matched_beats']}/{metrics['total_film_beats']} film beats")
-        print(f"  - Alignment score: {metrics['alignment_score_percent']:.1f}%")
-        print(f"  - Direct transpositions: {metrics['direct_transpositions']}")
-        print(f"  - Structural homologies: {metrics['structural_homologies']}")
+        log(f"  - Matched {metrics['matched_beats']}/{metrics['total_film_beats']} film beats")
+        log(f"  - Alignment score: {metrics['alignment_score_percent']:.1f}%")
+        log(f"  - Direct transpositions: {metrics['direct_transpositions']}")
+        log(f"  - Structural homologies: {metrics['structural_homologies']}")
+        log.flush()
         
         # Generate visualizations
-        print("[3/4] Generating visualizations...")
-        
-        # Figure 1: Timeline alignment
-        fig1 = self.plot_timeline_alignment()
-        fig1_paths = save_figure(fig1, self.output_dir / 'figures' / 'exp1_timeline_alignment')
-        plt.close(fig1)
-        print(f"  - Saved: {fig1_paths}")
-        
-        # Figure 2: Beat type comparison
-        fig2 = self.plot_beat_type_comparison()
-        fig2_paths = save_figure(fig2, self.output_dir / 'figures' / 'exp1_beat_type_comparison')
-        plt.close(fig2)
-        print(f"  - Saved: {fig2_paths}")
+        log("[3/4] Generating visualizations...")
+        
+        # Figures are pyplot-free, so each save runs on a worker thread while
+        # the next figure is being built
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Figure 1: Timeline alignment
+            fig1 = self.plot_timeline_alignment()
+            save1 = executor.submit(save_figure, fig1,
+                                    self.output_dir / 'figures' / 'exp1_timeline_alignment')
+            
+            # Figure 2: Beat type comparison
+            fig2 = self.plot_beat_type_comparison()
+            save2 = executor.submit(save_figure, fig2,
+                                    self.output_dir / 'figures' / 'exp1_beat_type_comparison')
+            
+            fig1_paths = save1.result()
+            fig2_paths = save2.result()
+        log(f"  - Saved: {fig1_paths}")
+        log(f"  - Saved: {fig2_paths}")
+        log.flush()
         
         # Save tables and metrics
-        print("[4/4] Saving tables and metrics...")
+        log("[4/4] Saving tables and metrics...")
         
         # Alignment table
         table_df = self.alignment_table[['Beat Type', 'Film Timestamp', 'Film Beat', 
@@ -426,15 +495,16 @@ class StructuralAlignment:
                                        self.output_dir / 'tables' / 'exp1_alignment_table.md',
                                        'Structural Alignment: Film vs. Game Beats')
         csv_path = save_table_csv(table_df, self.output_dir / 'tables' / 'exp1_alignment_table.csv')
-        print(f"  - Saved: {md_path}")
-        print(f"  - Saved: {csv_path}")
+        log(f"  - Saved: {md_path}")
+        log(f"  - Saved: {csv_path}")
         
         # Metrics JSON
         metrics_path = self.output_dir / 'metrics' / 'exp1_alignment_metrics.json'
         save_json_data(metrics, str(metrics_path))
-        print(f"  - Saved: {metrics_path}")
+        log(f"  - Saved: {metrics_path}")
         
-        print("\n✓ Experiment 1 complete!")
+        log("\n✓ Experiment 1 complete!")
+        log.flush()
         
         return {
             'metrics': metrics,
@@ -16,23 +16,89 @@ Method:
 4. Visualize spatial distribution of narrative content
 """
 
-import json
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
+from matplotlib.figure import Figure
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
+from typing import Dict, List, Any, Optional, Callable, Tuple
 
 from .visualization import (
-    create_figure, save_figure, add_source_annotation,
+    save_figures, add_source_annotation,
     save_table_markdown, save_table_csv,
-    COLORS, get_classification_color, setup_style
+    COLORS, CLASSIFICATION_COLORS, setup_style
 )
 from .parsers import EventDumpParser, save_json_data
 
 
+# Number of most active maps shown in the density heatmap
+_HEATMAP_MAPS = 50
+
+# Bar count above which heatmap bars are rasterized in vector output
+_RASTERIZE_MIN_BARS = 200
+
+# Density classes, from most to least narrative-heavy
+_CLASSIFICATIONS = ['Story-Heavy', 'Mixed', 'Combat/Traversal']
+
+# Per-map command count columns, in stacked-bar order
+_COMMAND_COLUMNS = ['dialogue_count', 'battle_count', 'logic_count',
+                    'navigation_count', 'visual_audio_count', 'other_count']
+
+
+def _extreme_positions(values: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Positions of the k largest and k smallest values from one partition pass.
+    
+    Matches DataFrame.nlargest/nsmallest(k, keep='first'): ties at the
+    cut-off go to the earliest positions, and each result is ordered from
+    most extreme to least with ties in positional order.
+    
+    Args:
+        values: 1-D numeric array
+        k: Number of positions to select from each end
+        
+    Returns:
+        Tuple of (largest positions, smallest positions)
+    """
+    n = len(values)
+    k = min(k, n)
+    if k == 0:
+        empty = np.array([], dtype=np.intp)
+        return empty, empty
+    
+    # Both cut-off values from a single O(n) partition
+    part = np.partition(values, sorted({k - 1, n - k}))
+    low_cut, high_cut = part[k - 1], part[n - k]
+    
+    def select(strict_mask, tie_mask, order_key):
+        strict = np.flatnonzero(strict_mask)
+        ties = np.flatnonzero(tie_mask)[:k - len(strict)]
+        idx = np.sort(np.concatenate([strict, ties]))
+        return idx[np.argsort(order_key[idx], kind='stable')]
+    
+    largest = select(values > high_cut, values == high_cut, -values)
+    smallest = select(values < low_cut, values == low_cut, values)
+    return largest, smallest
+
+
+def _map_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert map rows to the metrics JSON record format.
+    
+    Args:
+        df: Frame with map_id, map_name and narrative_density columns
+        
+    Returns:
+        List of {'map_id', 'map_name', 'narrative_density'} dicts
+    """
+    return [
+        {'map_id': int(map_id), 'map_name': name, 'narrative_density': float(density)}
+        for map_id, name, density in zip(df['map_id'].to_numpy(),
+                                          df['map_name'].to_numpy(),
+                                          df['narrative_density'].to_numpy())
+    ]
+
+
 class NarrativeDensity:
     """
     Analyze narrative density across game maps.
@@ -59,10 +125,17 @@ class NarrativeDensity:
         self.parser = EventDumpParser()
         self.density_df: Optional[pd.DataFrame] = None
         self.statistics: Dict[str, Any] = {}
+        self._cache: Dict[str, Any] = {}  # Derived frames shared by plots/statistics
+        self._styled = False  # Whether setup_style() has run for this instance
         
     def load_and_parse(self):
-        """Load and parse EventTextDump.txt."""
+        """Load and parse EventTextDump.txt (once per instance)."""
+        if self.density_df is not None:
+            return
+        
+        self._cache = {}
         dump_path = self.data_dir / 'EventTextDump.txt'
+        
         self.parser.parse_file(str(dump_path))
         
         # Calculate density for all maps
@@ -71,9 +144,56 @@ class NarrativeDensity:
         # Filter to maps with content
         self.density_df = self.density_df[self.density_df['total_commands'] > 0]
         
+        # Fixed three-value vocabulary: compare/group on integer codes
+        self.density_df = self.density_df.assign(classification=pd.Categorical(
+            self.density_df['classification'], categories=_CLASSIFICATIONS
+        ))
+        
+        # Counts fit comfortably in int32; halves the working set for reductions.
+        # narrative_density stays float64 so its 4-decimal values round-trip exactly.
+        int_cols = ['map_id', 'total_commands'] + _COMMAND_COLUMNS
+        self.density_df = self.density_df.astype({c: np.int32 for c in int_cols})
+        
         print(f"Parsed {len(self.parser.maps)} maps")
         print(f"Found {len(self.density_df)} maps with content")
         
+    def _ensure_style(self):
+        """Apply the shared plot style once rather than once per figure."""
+        if not self._styled:
+            setup_style()
+            self._styled = True
+    
+    def _derived(self, key: str, compute: Callable[[pd.DataFrame], Any]) -> Any:
+        """
+        Memoize a frame derived from density_df.
+        
+        Args:
+            key: Cache key
+            compute: Function of density_df producing the derived value
+            
+        Returns:
+            Cached derived value
+        """
+        if self.density_df is None:
+            self.load_and_parse()
+        if key not in self._cache:
+            self._cache[key] = compute(self.density_df)
+        return self._cache[key]
+    
+    def _density_extremes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Row positions of the ten highest- and ten lowest-density maps."""
+        return self._derived('density_extremes', lambda df: _extreme_positions(
+            df['narrative_density'].to_numpy(), 10
+        ))
+    
+    def _top_story(self) -> pd.DataFrame:
+        """Ten maps with the highest narrative density."""
+        return self._derived('top_story', lambda df: df.iloc[self._density_extremes()[0]])
+    
+    def _top_combat(self) -> pd.DataFrame:
+        """Ten maps with the lowest narrative density."""
+        return self._derived('top_combat', lambda df: df.iloc[self._density_extremes()[1]])
+    
     def calculate_statistics(self) -> Dict[str, Any]:
         """
         Calculate summary statistics for narrative density.
@@ -85,39 +205,46 @@ class NarrativeDensity:
             self.load_and_parse()
         
         df = self.density_df
+        n = len(df)
+        
+        # Single pass over the classification column
+        class_counts = df['classification'].value_counts()
+        story_heavy = int(class_counts.get('Story-Heavy', 0))
+        mixed = int(class_counts.get('Mixed', 0))
+        combat_traversal = int(class_counts.get('Combat/Traversal', 0))
+        
+        # Fused reductions: one agg over density, one sum over the count columns
+        density = df['narrative_density'].agg(['mean', 'median', 'std', 'min', 'max'])
+        totals = df[['dialogue_count', 'battle_count', 'logic_count', 'total_commands']].sum()
         
         self.statistics = {
             'total_maps': len(df),
-            'mean_density': round(df['narrative_density'].mean(), 4),
-            'median_density': round(df['narrative_density'].median(), 4),
-            'std_density': round(df['narrative_density'].std(), 4),
-            'min_density': round(df['narrative_density'].min(), 4),
-            'max_density': round(df['narrative_density'].max(), 4),
+            'mean_density': round(density['mean'], 4),
+            'median_density': round(density['median'], 4),
+            'std_density': round(density['std'], 4),
+            'min_density': round(density['min'], 4),
+            'max_density': round(density['max'], 4),
             
             # Classification counts
-            'story_heavy_count': int((df['classification'] == 'Story-Heavy').sum()),
-            'mixed_count': int((df['classification'] == 'Mixed').sum()),
-            'combat_traversal_count': int((df['classification'] == 'Combat/Traversal').sum()),
+            'story_heavy_count': story_heavy,
+            'mixed_count': mixed,
+            'combat_traversal_count': combat_traversal,
             
             # Percentages
-            'story_heavy_pct': round((df['classification'] == 'Story-Heavy').mean() * 100, 2),
-            'mixed_pct': round((df['classification'] == 'Mixed').mean() * 100, 2),
-            'combat_traversal_pct': round((df['classification'] == 'Combat/Traversal').mean() * 100, 2),
+            'story_heavy_pct': round(story_heavy / n * 100, 2) if n else 0.0,
+            'mixed_pct': round(mixed / n * 100, 2) if n else 0.0,
+            'combat_traversal_pct': round(combat_traversal / n * 100, 2) if n else 0.0,
             
             # Command totals
-            'total_dialogue_commands': int(df['dialogue_count'].sum()),
-            'total_battle_commands': int(df['battle_count'].sum()),
-            'total_logic_commands': int(df['logic_count'].sum()),
-            'total_all_commands': int(df['total_commands'].sum()),
+            'total_dialogue_commands': int(totals['dialogue_count']),
+            'total_battle_commands': int(totals['battle_count']),
+            'total_logic_commands': int(totals['logic_count']),
+            'total_all_commands': int(totals['total_commands']),
         }
         
-        # Top story-heavy maps
-        top_story = df.nlargest(10, 'narrative_density')[['map_id', 'map_name', 'narrative_density']]
-        self.statistics['top_story_maps'] = top_story.to_dict('records')
-        
-        # Top combat maps
-        top_combat = df.nsmallest(10, 'narrative_density')[['map_id', 'map_name', 'narrative_density']]
-        self.statistics['top_combat_maps'] = top_combat.to_dict('records')
+        # Top story-heavy and combat maps, boxed straight from the columns
+        self.statistics['top_story_maps'] = _map_records(self._top_story())
+        self.statistics['top_combat_maps'] = _map_records(self._top_combat())
         
         return self.statistics
     
@@ -128,36 +255,42 @@ class NarrativeDensity:
         Returns:
             Matplotlib figure
         """
-        setup_style()
+        self._ensure_style()
         
         if self.density_df is None:
             self.load_and_parse()
         
-        # Sort by density
-        df = self.density_df.sort_values('narrative_density', ascending=True).copy()
+        # Limit to maps with meaningful content (top N by total commands), sorted by density
+        def most_active(d):
+            top = _extreme_positions(d['total_commands'].to_numpy(), _HEATMAP_MAPS)[0]
+            return d.iloc[top].sort_values('narrative_density', ascending=True)
         
-        # Limit to maps with meaningful content (top 50 by total commands)
-        df = df.nlargest(50, 'total_commands').sort_values('narrative_density', ascending=True)
+        df = self._derived('heatmap_maps', most_active)
         
         # Create tall figure
         fig_height = max(8, len(df) * 0.25)
-        fig, ax = plt.subplots(figsize=(10, fig_height))
+        fig = Figure(figsize=(10, fig_height))
+        ax = fig.subplots()
         
         # Color by classification
-        colors = df['classification'].apply(get_classification_color)
+        colors = df['classification'].map(CLASSIFICATION_COLORS).astype(object).fillna(COLORS['mixed'])
         
         # Create bar chart
         y_pos = np.arange(len(df))
-        bars = ax.barh(y_pos, df['narrative_density'], color=colors, edgecolor='white', linewidth=0.5)
+        # Bars are rasterized in vector output once there are enough of them
+        # to outweigh the embedded image; text and axes stay vector
+        bars = ax.barh(y_pos, df['narrative_density'], color=colors, edgecolor='white', linewidth=0.5,
+                       rasterized=len(df) > _RASTERIZE_MIN_BARS)
         
         # Labels
-        labels = [f"Map {row['map_id']:03d}: {row['map_name'][:15]}" for _, row in df.iterrows()]
+        labels = [f"Map {map_id:03d}: {name}" for map_id, name in
+                  zip(df['map_id'].to_numpy(), df['map_name'].str.slice(0, 15).to_numpy())]
         ax.set_yticks(y_pos)
         ax.set_yticklabels(labels, fontsize=8)
         
         ax.set_xlabel('Narrative Density (Dialogue / Total Commands)')
         ax.set_xlim(0, 1.0)
-        ax.set_title('Narrative Density Across Game Maps\n(Top 50 Maps by Activity)', 
+        ax.set_title(f'Narrative Density Across Game Maps\n(Top {_HEATMAP_MAPS} Maps by Activity)', 
                      fontsize=14, fontweight='bold')
         
         # Add classification legend
@@ -170,12 +303,12 @@ class NarrativeDensity:
         ax.legend(handles=legend_elements, loc='lower right', fontsize=9)
         
         # Add vertical reference lines
-        ax.axvline(x=0.3, color='gray', linestyle='--', alpha=0.5)
-        ax.axvline(x=0.7, color='gray', linestyle='--', alpha=0.5)
+        ax.vlines([0.3, 0.7], 0, 1, transform=ax.get_xaxis_transform(),
+                  colors='gray', linestyles='--', alpha=0.5)
         
         add_source_annotation(ax, 'Source: EventTextDump.txt analysis')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         return fig
     
@@ -186,28 +319,25 @@ class NarrativeDensity:
         Returns:
             Matplotlib figure
         """
-        setup_style()
+        self._ensure_style()
         
         if self.density_df is None:
             self.load_and_parse()
         
-        df = self.density_df
-        
-        # Get top 10 for each category
-        top_story = df.nlargest(10, 'narrative_density')
-        top_combat = df[df['narrative_density'] < 0.3].nsmallest(10, 'narrative_density')
-        
-        # If not enough combat maps, get lowest overall
-        if len(top_combat) < 10:
-            top_combat = df.nsmallest(10, 'narrative_density')
+        # Get top 10 for each category. The ten lowest-density maps overall
+        # are the ten lowest Combat/Traversal maps whenever there are at least
+        # ten of them, and the intended fallback otherwise
+        top_story = self._top_story()
+        top_combat = self._top_combat()
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        fig = Figure(figsize=(14, 6))
+        ax1, ax2 = fig.subplots(1, 2)
         
         # Story-heavy panel
         y_pos = np.arange(len(top_story))
-        ax1.barh(y_pos, top_story['narrative_density'], color=COLORS['story'], 
+        bars1 = ax1.barh(y_pos, top_story['narrative_density'], color=COLORS['story'], 
                  edgecolor='white', linewidth=0.5)
-        labels1 = [f"{row['map_name'][:20]}" for _, row in top_story.iterrows()]
+        labels1 = top_story['map_name'].str.slice(0, 20).tolist()
         ax1.set_yticks(y_pos)
         ax1.set_yticklabels(labels1, fontsize=9)
         ax1.set_xlabel('Narrative Density')
@@ -216,14 +346,13 @@ class NarrativeDensity:
         ax1.invert_yaxis()
         
         # Add value labels
-        for i, v in enumerate(top_story['narrative_density']):
-            ax1.text(v + 0.02, i, f'{v:.2f}', va='center', fontsize=9)
+        ax1.bar_label(bars1, fmt='%.2f', padding=3, fontsize=9)
         
         # Combat/traversal panel
         y_pos = np.arange(len(top_combat))
-        ax2.barh(y_pos, top_combat['narrative_density'], color=COLORS['combat'],
+        bars2 = ax2.barh(y_pos, top_combat['narrative_density'], color=COLORS['combat'],
                  edgecolor='white', linewidth=0.5)
-        labels2 = [f"{row['map_name'][:20]}" for _, row in top_combat.iterrows()]
+        labels2 = top_combat['map_name'].str.slice(0, 20).tolist()
         ax2.set_yticks(y_pos)
         ax2.set_yticklabels(labels2, fontsize=9)
         ax2.set_xlabel('Narrative Density')
@@ -232,13 +361,12 @@ class NarrativeDensity:
         ax2.invert_yaxis()
         
         # Add value labels
-        for i, v in enumerate(top_combat['narrative_density']):
-            ax2.text(v + 0.01, i, f'{v:.2f}', va='center', fontsize=9)
+        ax2.bar_label(bars2, fmt='%.2f', padding=3, fontsize=9)
         
         fig.suptitle('Spatial Storytelling Patterns: Narrative Distribution', 
                      fontsize=14, fontweight='bold', y=1.02)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         return fig
     
@@ -249,14 +377,15 @@ class NarrativeDensity:
         Returns:
             Matplotlib figure
         """
-        setup_style()
+        self._ensure_style()
         
         if self.density_df is None:
             self.load_and_parse()
         
         df = self.density_df
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        fig = Figure(figsize=(12, 5))
+        ax1, ax2 = fig.subplots(1, 2)
         
         # Histogram
         ax1.hist(df['narrative_density'], bins=20, color=COLORS['mixed'], 
@@ -271,12 +400,13 @@ class NarrativeDensity:
         ax1.legend(loc='upper right')
         
         # Add threshold lines
-        ax1.axvline(x=0.3, color='gray', linestyle=':', alpha=0.7)
-        ax1.axvline(x=0.7, color='gray', linestyle=':', alpha=0.7)
+        ax1.vlines([0.3, 0.7], 0, 1, transform=ax1.get_xaxis_transform(),
+                   colors='gray', linestyles=':', alpha=0.7)
         
-        # Pie chart of classifications
+        # Pie chart of classifications (categorical counts include empty classes)
         class_counts = df['classification'].value_counts()
-        colors = [get_classification_color(c) for c in class_counts.index]
+        class_counts = class_counts[class_counts > 0]
+        colors = class_counts.index.map(CLASSIFICATION_COLORS).fillna(COLORS['mixed'])
         
         wedges, texts, autotexts = ax2.pie(
             class_counts.values, 
@@ -293,7 +423,7 @@ class NarrativeDensity:
             autotext.set_fontweight('bold')
             autotext.set_fontsize(10)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         return fig
     
@@ -304,7 +434,7 @@ class NarrativeDensity:
         Returns:
             Matplotlib figure
         """
-        setup_style()
+        self._ensure_style()
         
         if self.density_df is None:
             self.load_and_parse()
@@ -312,30 +442,25 @@ class NarrativeDensity:
         df = self.density_df
         
         # Aggregate by classification
-        agg_data = df.groupby('classification').agg({
-            'dialogue_count': 'sum',
-            'battle_count': 'sum',
-            'logic_count': 'sum',
-            'navigation_count': 'sum',
-            'visual_audio_count': 'sum',
-            'other_count': 'sum'
-        })
+        agg_data = self._derived('agg_by_class', lambda d: (
+            d.groupby('classification', sort=False, observed=True)[_COMMAND_COLUMNS].sum()
+        ))
         
-        # Calculate percentages
-        totals = agg_data.sum(axis=1)
-        agg_pct = agg_data.div(totals, axis=0) * 100
+        # Calculate percentages in place on one float array
+        pct = agg_data.to_numpy(dtype=np.float64)
+        pct *= 100.0 / pct.sum(axis=1, keepdims=True)
+        agg_pct = pd.DataFrame(pct, index=agg_data.index, columns=agg_data.columns)
         
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
         
-        categories = ['Story-Heavy', 'Mixed', 'Combat/Traversal']
-        categories = [c for c in categories if c in agg_pct.index]
+        categories = [c for c in _CLASSIFICATIONS if c in agg_pct.index]
         
         x = np.arange(len(categories))
         width = 0.5
         
         # Create stacked bars
-        command_types = ['dialogue_count', 'battle_count', 'logic_count', 
-                        'navigation_count', 'visual_audio_count', 'other_count']
+        command_types = _COMMAND_COLUMNS
         labels = ['Dialogue', 'Battle', 'Logic', 'Navigation', 'Visual/Audio', 'Other']
         colors = ['#E74C3C', '#3498DB', '#9B59B6', '#2ECC71', '#F39C12', '#95A5A6']
         
@@ -356,7 +481,7 @@ class NarrativeDensity:
         ax.set_title('Command Type Breakdown by Map Classification', 
                      fontsize=14, fontweight='bold')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         return fig
     
@@ -390,39 +515,26 @@ class NarrativeDensity:
         
         # Generate visualizations
         print("[3/4] Generating visualizations...")
+        self._ensure_style()
         
-        # Figure 1: Density heatmap
-        fig1 = self.plot_density_heatmap()
-        fig1_paths = save_figure(fig1, self.output_dir / 'figures' / 'exp2_density_heatmap')
-        plt.close(fig1)
-        print(f"  - Saved: {fig1_paths}")
-        
-        # Figure 2: Top maps comparison
-        fig2 = self.plot_top_maps_comparison()
-        fig2_paths = save_figure(fig2, self.output_dir / 'figures' / 'exp2_top_maps_comparison')
-        plt.close(fig2)
-        print(f"  - Saved: {fig2_paths}")
-        
-        # Figure 3: Distribution
-        fig3 = self.plot_density_distribution()
-        fig3_paths = save_figure(fig3, self.output_dir / 'figures' / 'exp2_density_distribution')
-        plt.close(fig3)
-        print(f"  - Saved: {fig3_paths}")
-        
-        # Figure 4: Command breakdown
-        fig4 = self.plot_command_breakdown()
-        fig4_paths = save_figure(fig4, self.output_dir / 'figures' / 'exp2_command_breakdown')
-        plt.close(fig4)
-        print(f"  - Saved: {fig4_paths}")
+        figures = [
+            (self.plot_density_heatmap, 'exp2_density_heatmap'),            # Figure 1
+            (self.plot_top_maps_comparison, 'exp2_top_maps_comparison'),    # Figure 2
+            (self.plot_density_distribution, 'exp2_density_distribution'),  # Figure 3
+            (self.plot_command_breakdown, 'exp2_command_breakdown'),        # Figure 4
+        ]
+        figure_paths = save_figures(figures, self.output_dir / 'figures')
+        for paths in figure_paths:
+            print(f"  - Saved: {paths}")
         
         # Save tables and metrics
         print("[4/4] Saving tables and metrics...")
         
         # Full density table
-        table_df = self.density_df[['map_id', 'map_name', 'dialogue_count', 'total_commands',
-                                     'narrative_density', 'classification']].sort_values(
-            'narrative_density', ascending=False
-        )
+        # Sort only the key column, then gather rows and columns in one take
+        order = self.density_df['narrative_density'].sort_values(ascending=False).index
+        table_df = self.density_df.loc[order, ['map_id', 'map_name', 'dialogue_count', 'total_commands',
+                                               'narrative_density', 'classification']]
         md_path = save_table_markdown(table_df, 
                                        self.output_dir / 'tables' / 'exp2_density_table.md',
                                        'Narrative Density by Map')
@@ -439,7 +551,7 @@ class NarrativeDensity:
         
         return {
             'metrics': stats,
-            'figures': fig1_paths + fig2_paths + fig3_paths + fig4_paths,
+            'figures': [path for paths in figure_paths for path in paths],
             'tables': [md_path, csv_path],
             'metrics_file': str(metrics_path)
         }
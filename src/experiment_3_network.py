@@ -17,22 +17,98 @@ Method:
 5. Visualize with force-directed layout
 """
 
+import os
+import re
 import json
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import networkx as nx
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Set
 from collections import defaultdict
-from itertools import combinations
+from itertools import chain
 
 from .visualization import (
-    create_figure, save_figure, add_source_annotation,
+    create_figure, save_figures, add_source_annotation,
     save_table_markdown, save_table_csv,
     COLORS, get_community_color, setup_style
 )
-from .parsers import EventDumpParser, NarrativeExtractionParser, load_json_data, save_json_data
+from .parsers import (
+    NarrativeExtractionParser, load_json_data, save_json_data,
+    load_dialogues
+)
+
+try:
+    import ahocorasick  # Optional: single-pass multi-keyword matching
+except ImportError:
+    ahocorasick = None
+
+# Node count above which only the highest-degree nodes are labelled
+_LABEL_MAX_NODES = 50
+
+# Node count above which network edges and markers are rasterized in vector output
+_RASTERIZE_MIN_NODES = 200
+
+
+def _accumulate_pairs(offsets: np.ndarray, ids: np.ndarray,
+                      k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count keyword pairs over all dialogues at once.
+    
+    The matches form a (dialogues x keywords) 0/1 incidence matrix M, and
+    M.T @ M counts every pair in one matrix product; with a few dozen
+    keywords M stays small enough to hold densely. The pairs are also
+    returned in order of first appearance (first dialogue containing the
+    pair, then position), which is the insertion order co_occurrence has
+    always had and which later ties and edge order depend on.
+    
+    Args:
+        offsets: CSR offsets into ids, one more than the number of dialogues
+        ids: Sorted matched keyword positions of each dialogue, concatenated
+        k: Number of keywords
+        
+    Returns:
+        Tuple of (upper-triangular int32 counts, row positions, column
+        positions), the positions listing each counted pair once in order
+        of first appearance
+    """
+    n_dialogues = len(offsets) - 1
+    dialogue = np.repeat(np.arange(n_dialogues), np.diff(offsets))
+    incidence = np.zeros((n_dialogues, k), dtype=np.float64)  # Exact for counts < 2**53
+    incidence[dialogue, ids] = 1
+    
+    counts = np.triu(incidence.T @ incidence, k=1).astype(np.int32)
+    
+    rows, cols = np.nonzero(counts)
+    if rows.size:
+        present = incidence.astype(bool)
+        first_dialogue = np.argmax(present[:, rows] & present[:, cols], axis=0)
+        order = np.lexsort((cols, rows, first_dialogue))
+        rows, cols = rows[order], cols[order]
+    return counts, rows, cols
+
+
+def _pairs_from_counts(counts: np.ndarray, rows: np.ndarray, cols: np.ndarray,
+                       keywords: List[str]) -> Dict[Tuple[str, str], int]:
+    """
+    Name-keyed co-occurrence counts from a position-indexed count matrix.
+    
+    Args:
+        counts: Upper-triangular pair counts by keyword position
+        rows: Row position of each pair, in first-appearance order
+        cols: Column position of each pair, in first-appearance order
+        keywords: Keyword for each position
+        
+    Returns:
+        Defaultdict of sorted name pairs to counts, ordered by first appearance
+    """
+    pairs: Dict[Tuple[str, str], int] = defaultdict(int)
+    for i, j, count in zip(rows, cols, counts[rows, cols]):
+        # Normalize pair ordering for consistency; repeated keywords merge here
+        pairs[tuple(sorted((keywords[i], keywords[j])))] += int(count)
+    return pairs
 
 
 class SemanticNetwork:
@@ -47,6 +123,7 @@ class SemanticNetwork:
         entities: List of entity keywords to track
         themes: List of theme keywords to track
         co_occurrence: Defaultdict of co-occurrence counts
+        co_counts: Upper-triangular co-occurrence matrix by keyword position
         graph: NetworkX graph
         communities: Community partition dictionary
     """
@@ -64,9 +141,14 @@ class SemanticNetwork:
         self.entities: List[str] = []
         self.themes: List[str] = []
         self.co_occurrence: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.co_counts: np.ndarray = np.zeros((0, 0), dtype=np.int32)  # By keyword position
         self.graph: Optional[nx.Graph] = None
         self.communities: Dict[str, int] = {}
         self.node_types: Dict[str, str] = {}  # 'entity' or 'theme'
+        self._automaton = None  # Aho-Corasick matcher over entities + themes
+        self._keyword_re = None  # Regex matcher used when pyahocorasick is missing
+        self._keyword_positions: Dict[str, Tuple[int, ...]] = {}
+        self._prefix_keywords: List[str] = []
         
     def load_keywords(self):
         """Load entity and theme keywords from context_keywords.json."""
@@ -82,6 +164,33 @@ class SemanticNetwork:
         for t in self.themes:
             self.node_types[t] = 'theme'
         
+        # One matcher for all keywords, case-folded once here (texts are folded
+        # once per dialogue); each folded word maps to every position it holds
+        # in entities + themes so duplicates are reported like the `in` scan.
+        # Node names keep their original spelling.
+        positions = defaultdict(list)
+        for idx, kw in enumerate(self.entities + self.themes):
+            positions[kw.casefold()].append(idx)
+        self._automaton = None
+        self._keyword_re = None
+        self._keyword_positions = {kw: tuple(idxs) for kw, idxs in positions.items()}
+        if positions and '' not in positions:
+            if ahocorasick is not None:
+                self._automaton = ahocorasick.Automaton()
+                for kw, idxs in self._keyword_positions.items():
+                    self._automaton.add_word(kw, idxs)
+                self._automaton.make_automaton()
+            else:
+                # Fallback: one lookahead alternation reports a match at every
+                # start position, so overlapping keywords are found; keywords
+                # that are a prefix of a longer one are tested separately
+                by_length = sorted(positions, key=len, reverse=True)
+                self._keyword_re = re.compile(
+                    '(?=(' + '|'.join(re.escape(kw) for kw in by_length) + '))'
+                )
+                self._prefix_keywords = [kw for kw in positions
+                                         if any(o != kw and o.startswith(kw) for o in positions)]
+        
         print(f"Loaded {len(self.entities)} entities and {len(self.themes)} themes")
         
     def extract_dialogues(self) -> List[Dict[str, Any]]:
@@ -91,9 +200,54 @@ class SemanticNetwork:
         Returns:
             List of dialogue dictionaries
         """
-        parser = EventDumpParser()
-        parser.parse_file(str(self.data_dir / 'EventTextDump.txt'))
-        return parser.extract_all_dialogue()
+        return load_dialogues(str(self.data_dir / 'EventTextDump.txt'))
+    
+    def _present_ids(self, text: str) -> np.ndarray:
+        """
+        Positions of the keywords occurring in a case-folded dialogue text.
+        
+        Uses the Aho-Corasick automaton when pyahocorasick is installed, and
+        a single compiled regex otherwise; both are one pass over the text
+        with overlapping matches included.
+        
+        Args:
+            text: Case-folded dialogue text
+            
+        Returns:
+            Sorted int array of positions in entities + themes
+        """
+        if self._keyword_re is not None:
+            found = set(self._keyword_re.findall(text))
+            found.update(kw for kw in self._prefix_keywords if kw in text)
+            hits = np.fromiter(chain.from_iterable(self._keyword_positions[kw] for kw in found),
+                               dtype=np.intp)
+            return np.unique(hits)
+        
+        if self._automaton is None:
+            hits = np.fromiter(chain.from_iterable(idxs for kw, idxs in self._keyword_positions.items()
+                                                   if kw in text), dtype=np.intp)
+            return np.unique(hits)
+        
+        hits = np.fromiter(chain.from_iterable(idxs for _, idxs in self._automaton.iter(text)),
+                           dtype=np.intp)
+        return np.unique(hits)
+    
+    def match_dialogues(self, dialogues: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the keywords present in each dialogue, ignoring case.
+        
+        Args:
+            dialogues: List of dialogue dictionaries with 'text' field
+            
+        Returns:
+            CSR-style (offsets, ids): dialogue i matched the keyword
+            positions ids[offsets[i]:offsets[i + 1]], in keyword order
+        """
+        matches = [self._present_ids((d.get('text', '') or '').casefold()) for d in dialogues]
+        lengths = np.fromiter((m.size for m in matches), dtype=np.intp, count=len(matches))
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        ids = np.concatenate(matches) if matches else np.zeros(0, dtype=np.intp)
+        return offsets, ids
     
     def process_dialogues(self, dialogues: List[Dict[str, Any]]):
         """
@@ -102,20 +256,24 @@ class SemanticNetwork:
         Args:
             dialogues: List of dialogue dictionaries with 'text' field
         """
-        self.co_occurrence = defaultdict(int)
-        all_keywords = self.entities + self.themes
+        self.process_matches(*self.match_dialogues(dialogues))
+    
+    def process_matches(self, offsets: np.ndarray, ids: np.ndarray):
+        """
+        Build co-occurrence matrix from per-dialogue keyword matches.
         
-        for dialogue in dialogues:
-            text = dialogue.get('text', '') or ''
-            
-            # Find all present keywords in this dialogue
-            present = [kw for kw in all_keywords if kw in text]
-            
-            # Count co-occurrences (all pairs)
-            for kw1, kw2 in combinations(present, 2):
-                # Normalize pair ordering for consistency
-                pair = tuple(sorted([kw1, kw2]))
-                self.co_occurrence[pair] += 1
+        Pairs are counted in an upper-triangular int32 matrix indexed by
+        keyword position (self.co_counts); self.co_occurrence is the
+        name-keyed view of it, in order of each pair's first appearance.
+        
+        Args:
+            offsets: CSR offsets into ids, one more than the number of dialogues
+            ids: Matched keyword positions of each dialogue, concatenated
+        """
+        all_keywords = self.entities + self.themes
+        counts, rows, cols = _accumulate_pairs(offsets, ids, len(all_keywords))
+        self.co_counts = counts
+        self.co_occurrence = _pairs_from_counts(counts, rows, cols, all_keywords)
         
         print(f"Found {len(self.co_occurrence)} co-occurrence pairs")
         
@@ -129,32 +287,139 @@ class SemanticNetwork:
         Returns:
             NetworkX graph
         """
-        self.graph = nx.Graph()
-        
-        # Add nodes
-        for e in self.entities:
-            self.graph.add_node(e, node_type='entity')
-        for t in self.themes:
-            self.graph.add_node(t, node_type='theme')
+        # Edges above threshold, in first-appearance order
+        edges = [(node1, node2, weight) for (node1, node2), weight in self.co_occurrence.items()
+                 if weight >= threshold]
         
-        # Add edges above threshold
-        for (node1, node2), weight in self.co_occurrence.items():
-            if weight >= threshold:
-                self.graph.add_edge(node1, node2, weight=weight)
+        # Only keywords with at least one edge become nodes, in keyword order,
+        # so no isolates need removing afterwards
+        connected = {n for node1, node2, _ in edges for n in (node1, node2)}
+        keywords = list(dict.fromkeys(self.entities + self.themes))
+        isolated = [n for n in keywords if n not in connected]
         
-        # Remove isolated nodes
-        isolated = list(nx.isolates(self.graph))
-        self.graph.remove_nodes_from(isolated)
+        self.graph = nx.Graph()
+        self.graph.add_nodes_from((n, {'node_type': self.node_types[n]})
+                                  for n in keywords if n in connected)
+        self.graph.add_weighted_edges_from(edges)
         
         print(f"Network: {self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges")
         print(f"Removed {len(isolated)} isolated nodes")
         
         return self.graph
     
+    def _edge_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        COO view of the graph for handing to C++-backed graph libraries.
+        
+        Returns:
+            Tuple of (nodes, row positions, column positions, edge weights),
+            with positions indexing into nodes
+        """
+        nodes = list(self.graph.nodes())
+        index = {n: i for i, n in enumerate(nodes)}
+        edges = list(self.graph.edges(data='weight', default=1))
+        rows = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges))
+        cols = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges))
+        weights = np.fromiter((w for _, _, w in edges), dtype=np.float64, count=len(edges))
+        return nodes, rows, cols, weights
+    
+    def _adjacency_stats(self) -> Tuple[Dict[str, int], float]:
+        """
+        Node degrees and average clustering from a dense adjacency matrix.
+        
+        The network has at most one node per keyword, so a dense matrix is
+        small, and degrees and triangle counts each take one NumPy reduction.
+        Clustering is unweighted with zero for nodes of degree < 2, as in
+        nx.average_clustering.
+        
+        Returns:
+            Tuple of (node -> degree in graph order, average clustering)
+        """
+        nodes, rows, cols, _ = self._edge_arrays()
+        n = len(nodes)
+        adjacency = np.zeros((n, n))
+        adjacency[rows, cols] = 1
+        adjacency[cols, rows] = 1
+        
+        degrees = adjacency.sum(axis=1)
+        triangles = ((adjacency @ adjacency) * adjacency).sum(axis=1) / 2
+        possible = degrees * (degrees - 1) / 2
+        clustering = np.divide(triangles, possible, out=np.zeros(n), where=possible > 0)
+        
+        return ({node: int(d) for node, d in zip(nodes, degrees)},
+                float(clustering.mean()) if n else 0.0)
+    
+    def _igraph_centrality(self) -> Optional[Tuple[float, Dict[str, float]]]:
+        """
+        Average clustering and betweenness centrality computed with igraph.
+        
+        Both are unweighted, and betweenness is normalized as in NetworkX,
+        so the values match nx.average_clustering / nx.betweenness_centrality
+        up to floating-point rounding.
+        
+        Returns:
+            Tuple of (average clustering, node -> betweenness), or None if
+            igraph is not installed
+        """
+        try:
+            import igraph as ig
+        except ImportError:
+            return None
+        
+        nodes, rows, cols, _ = self._edge_arrays()
+        G_ig = ig.Graph(n=len(nodes), edges=np.column_stack((rows, cols)).tolist())
+        
+        n = len(nodes)
+        scale = 2 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+        betweenness = G_ig.betweenness(directed=False)
+        avg_clustering = G_ig.transitivity_avglocal_undirected(mode='zero')
+        return avg_clustering, {node: b * scale for node, b in zip(nodes, betweenness)}
+    
+    def _detect_communities_backend(self, backend: str) -> Optional[Dict[str, int]]:
+        """
+        Run Louvain community detection on a C++-backed graph library.
+        
+        Args:
+            backend: 'networkit' or 'igraph'
+            
+        Returns:
+            Dictionary mapping node names to community IDs, or None if the
+            backend is unknown or not installed
+        """
+        if backend not in ('networkit', 'igraph'):
+            return None
+        
+        nodes, rows, cols, weights = self._edge_arrays()
+        
+        if backend == 'networkit':
+            try:
+                import networkit as nk
+            except ImportError:
+                return None
+            G_nk = nk.GraphFromCoo((weights, (rows, cols)), n=len(nodes),
+                                   weighted=True, directed=False)
+            plm = nk.community.PLM(G_nk, refine=True)
+            plm.run()
+            partition = plm.getPartition()
+            partition.compact()  # Renumber community IDs to 0..k-1
+            return {n: partition[i] for i, n in enumerate(nodes)}
+        
+        try:
+            import igraph as ig
+        except ImportError:
+            return None
+        G_ig = ig.Graph(n=len(nodes), edges=np.column_stack((rows, cols)).tolist(),
+                        edge_attrs={'weight': weights.tolist()})
+        membership = G_ig.community_multilevel(weights='weight').membership
+        return {n: membership[i] for i, n in enumerate(nodes)}
+    
     def detect_communities(self) -> Dict[str, int]:
         """
         Apply community detection using Louvain algorithm.
         
+        Set the NX_BACKEND environment variable to 'networkit' or 'igraph'
+        to run Louvain on that library instead of NetworkX-based packages.
+        
         Returns:
             Dictionary mapping node names to community IDs
         """
@@ -162,6 +427,26 @@ class SemanticNetwork:
             self.communities = {}
             return self.communities
         
+        # Trivial graph: when no component has more than two nodes, modularity
+        # is maximized by one community per component, so skip Louvain. That
+        # needs at most one edge per two nodes, which rules out most graphs
+        # before any traversal.
+        if self.graph.number_of_edges() * 2 <= self.graph.number_of_nodes():
+            components = list(nx.connected_components(self.graph))
+            if all(len(c) <= 2 for c in components):
+                community_of = {n: idx for idx, c in enumerate(components) for n in c}
+                self.communities = {n: community_of[n] for n in self.graph.nodes()}
+                print(f"Detected {len(components)} communities (connected components)")
+                return self.communities
+        
+        backend = os.environ.get('NX_BACKEND', '').lower()
+        communities = self._detect_communities_backend(backend) if backend else None
+        if communities is not None:
+            self.communities = communities
+            num_communities = len(set(self.communities.values()))
+            print(f"Detected {num_communities} communities ({backend})")
+            return self.communities
+        
         try:
             # Try python-louvain package
             import community.community_louvain as community_louvain
@@ -188,6 +473,9 @@ class SemanticNetwork:
         """
         Calculate network metrics.
         
+        With NX_BACKEND=igraph, average clustering and betweenness
+        centrality are computed with igraph instead of NetworkX.
+        
         Returns:
             Dictionary of network statistics
         """
@@ -202,23 +490,39 @@ class SemanticNetwork:
             }
         
         G = self.graph
+        n_nodes, n_edges = G.number_of_nodes(), G.number_of_edges()
+        
+        # Degree and local clustering from one adjacency pass (self-loops,
+        # which only repeated keywords can create, keep the NetworkX path)
+        adjacency_stats = self._adjacency_stats() if nx.number_of_selfloops(G) == 0 else None
         
         # Basic metrics
         metrics = {
-            'num_nodes': G.number_of_nodes(),
-            'num_edges': G.number_of_edges(),
-            'density': round(nx.density(G), 4),
+            'num_nodes': n_nodes,
+            'num_edges': n_edges,
+            'density': round(2 * n_edges / (n_nodes * (n_nodes - 1)) if n_nodes > 1 else 0, 4),
             'num_communities': len(set(self.communities.values())) if self.communities else 0
         }
         
+        # NX_BACKEND=igraph computes clustering and betweenness in C as well
+        igraph_centrality = None
+        if os.environ.get('NX_BACKEND', '').lower() == 'igraph':
+            igraph_centrality = self._igraph_centrality()
+        
         # Clustering coefficient
         try:
-            metrics['avg_clustering'] = round(nx.average_clustering(G), 4)
+            if igraph_centrality:
+                avg_clustering = igraph_centrality[0]
+            elif adjacency_stats:
+                avg_clustering = adjacency_stats[1]
+            else:
+                avg_clustering = nx.average_clustering(G)
+            metrics['avg_clustering'] = round(avg_clustering, 4)
         except:
             metrics['avg_clustering'] = 0
         
         # Degree statistics
-        degrees = dict(G.degree())
+        degrees = adjacency_stats[0] if adjacency_stats else dict(G.degree())
         if degrees:
             metrics['avg_degree'] = round(sum(degrees.values()) / len(degrees), 2)
             metrics['max_degree'] = max(degrees.values())
@@ -231,7 +535,8 @@ class SemanticNetwork:
         # Centrality metrics
         if G.number_of_nodes() > 0:
             try:
-                betweenness = nx.betweenness_centrality(G)
+                betweenness = (igraph_centrality[1] if igraph_centrality
+                               else nx.betweenness_centrality(G))
                 top_betweenness = sorted(betweenness.items(), key=lambda x: x[1], reverse=True)[:5]
                 metrics['top_betweenness'] = [{'node': n, 'score': round(s, 4)} for n, s in top_betweenness]
             except:
@@ -269,14 +574,16 @@ class SemanticNetwork:
         setup_style()
         
         if self.graph is None or self.graph.number_of_nodes() == 0:
-            fig, ax = plt.subplots(figsize=(10, 10))
+            fig = Figure(figsize=(10, 10))
+            ax = fig.subplots()
             ax.text(0.5, 0.5, 'No network data available', ha='center', va='center', fontsize=14)
             ax.axis('off')
             return fig
         
         G = self.graph
         
-        fig, ax = plt.subplots(figsize=(12, 12))
+        fig = Figure(figsize=(12, 12))
+        ax = fig.subplots()
         
         # Compute layout
         try:
@@ -284,17 +591,17 @@ class SemanticNetwork:
         except:
             pos = nx.circular_layout(G)
         
-        # Node colors by community
+        # Node colors by community, keyed by node
         if self.communities:
-            node_colors = [get_community_color(self.communities.get(n, 0)) for n in G.nodes()]
+            node_colors = {n: get_community_color(self.communities.get(n, 0)) for n in G.nodes()}
         else:
-            node_colors = [COLORS['entity'] if self.node_types.get(n) == 'entity' 
-                          else COLORS['theme'] for n in G.nodes()]
+            node_colors = {n: COLORS['entity'] if self.node_types.get(n) == 'entity'
+                           else COLORS['theme'] for n in G.nodes()}
         
-        # Node sizes by degree
+        # Node sizes by degree, keyed by node
         degrees = dict(G.degree())
         max_degree = max(degrees.values()) if degrees else 1
-        node_sizes = [300 + 500 * (degrees[n] / max_degree) for n in G.nodes()]
+        node_sizes = {n: 300 + 500 * (d / max_degree) for n, d in degrees.items()}
         
         # Node shapes (circles for entities, different marker would need custom drawing)
         # For simplicity, we'll use different edge colors for entities vs themes
@@ -304,43 +611,53 @@ class SemanticNetwork:
         max_weight = max(edge_weights) if edge_weights else 1
         edge_widths = [0.5 + 3 * (w / max_weight) for w in edge_weights]
         
-        nx.draw_networkx_edges(G, pos, ax=ax,
-                               width=edge_widths,
-                               alpha=0.4,
-                               edge_color='gray')
+        # Large graphs rasterize edges and nodes in vector output; text and
+        # axes stay vector
+        rasterize = G.number_of_nodes() > _RASTERIZE_MIN_NODES
+        
+        edges = nx.draw_networkx_edges(G, pos, ax=ax,
+                                       width=edge_widths,
+                                       alpha=0.4,
+                                       edge_color='gray')
         
         # Draw entity nodes
         entity_nodes = [n for n in G.nodes() if self.node_types.get(n) == 'entity']
-        entity_colors = [get_community_color(self.communities.get(n, 0)) if self.communities
-                        else COLORS['entity'] for n in entity_nodes]
-        entity_sizes = [node_sizes[list(G.nodes()).index(n)] for n in entity_nodes]
-        
-        nx.draw_networkx_nodes(G, pos, ax=ax,
-                               nodelist=entity_nodes,
-                               node_color=entity_colors,
-                               node_size=entity_sizes,
-                               node_shape='o',
-                               alpha=0.9,
-                               edgecolors='white',
-                               linewidths=2)
+        entity_colors = [node_colors[n] for n in entity_nodes]
+        entity_sizes = [node_sizes[n] for n in entity_nodes]
+        
+        entity_markers = nx.draw_networkx_nodes(G, pos, ax=ax,
+                                                nodelist=entity_nodes,
+                                                node_color=entity_colors,
+                                                node_size=entity_sizes,
+                                                node_shape='o',
+                                                alpha=0.9,
+                                                edgecolors='white',
+                                                linewidths=2)
         
         # Draw theme nodes
         theme_nodes = [n for n in G.nodes() if self.node_types.get(n) == 'theme']
-        theme_colors = [get_community_color(self.communities.get(n, 0)) if self.communities
-                       else COLORS['theme'] for n in theme_nodes]
-        theme_sizes = [node_sizes[list(G.nodes()).index(n)] for n in theme_nodes]
-        
-        nx.draw_networkx_nodes(G, pos, ax=ax,
-                               nodelist=theme_nodes,
-                               node_color=theme_colors,
-                               node_size=theme_sizes,
-                               node_shape='s',  # Square for themes
-                               alpha=0.9,
-                               edgecolors='white',
-                               linewidths=2)
-        
-        # Draw labels
-        nx.draw_networkx_labels(G, pos, ax=ax,
+        theme_colors = [node_colors[n] for n in theme_nodes]
+        theme_sizes = [node_sizes[n] for n in theme_nodes]
+        
+        theme_markers = nx.draw_networkx_nodes(G, pos, ax=ax,
+                                               nodelist=theme_nodes,
+                                               node_color=theme_colors,
+                                               node_size=theme_sizes,
+                                               node_shape='s',  # Square for themes
+                                               alpha=0.9,
+                                               edgecolors='white',
+                                               linewidths=2)
+        
+        for artist in (edges, entity_markers, theme_markers):
+            if artist is not None:  # Empty node lists draw nothing
+                artist.set_rasterized(rasterize)
+        
+        # Draw labels; on large graphs only the best-connected nodes get one
+        labels = None
+        if G.number_of_nodes() > _LABEL_MAX_NODES:
+            top = sorted(degrees, key=degrees.get, reverse=True)[:_LABEL_MAX_NODES]
+            labels = {n: n for n in top}
+        nx.draw_networkx_labels(G, pos, labels=labels, ax=ax,
                                 font_size=9,
                                 font_weight='bold')
         
@@ -369,7 +686,7 @@ class SemanticNetwork:
         
         ax.legend(handles=legend_elements, loc='lower left', fontsize=9)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         return fig
     
@@ -382,31 +699,35 @@ class SemanticNetwork:
         """
         setup_style()
         
-        # Get top nodes by total co-occurrence
-        node_totals = defaultdict(int)
-        for (n1, n2), count in self.co_occurrence.items():
-            node_totals[n1] += count
-            node_totals[n2] += count
+        # Symmetric name-level counts, with nodes in order of first appearance
+        # among the pairs so ties on total rank the same as before
+        names = list(dict.fromkeys(n for pair in self.co_occurrence for n in pair))
+        name_pos = {name: i for i, name in enumerate(names)}
+        all_keywords = self.entities + self.themes
+        kw_pos = np.array([name_pos.get(kw, -1) for kw in all_keywords], dtype=np.intp)
+        rows, cols = np.nonzero(self.co_counts)
+        sym = np.zeros((len(names), len(names)))
+        np.add.at(sym, (kw_pos[rows], kw_pos[cols]), self.co_counts[rows, cols])
+        sym += sym.T
         
-        top_nodes = sorted(node_totals.keys(), key=lambda x: node_totals[x], reverse=True)[:15]
+        # Get top nodes by total co-occurrence
+        top = np.argsort(-sym.sum(axis=1), kind='stable')[:15]
+        top_nodes = [names[i] for i in top]
         
         if len(top_nodes) < 2:
-            fig, ax = plt.subplots(figsize=(10, 8))
+            fig = Figure(figsize=(10, 8))
+            ax = fig.subplots()
             ax.text(0.5, 0.5, 'Insufficient data for heatmap', ha='center', va='center')
             ax.axis('off')
             return fig
         
         # Build matrix
         n = len(top_nodes)
-        matrix = np.zeros((n, n))
-        
-        for i, n1 in enumerate(top_nodes):
-            for j, n2 in enumerate(top_nodes):
-                if i != j:
-                    pair = tuple(sorted([n1, n2]))
-                    matrix[i, j] = self.co_occurrence.get(pair, 0)
+        matrix = sym[np.ix_(top, top)]
+        np.fill_diagonal(matrix, 0)
         
-        fig, ax = plt.subplots(figsize=(12, 10))
+        fig = Figure(figsize=(12, 10))
+        ax = fig.subplots()
         
         # Create heatmap
         im = ax.imshow(matrix, cmap='YlOrRd', aspect='auto')
@@ -417,7 +738,7 @@ class SemanticNetwork:
         ax.set_yticklabels(top_nodes, fontsize=9)
         
         # Add colorbar
-        cbar = plt.colorbar(im, ax=ax, shrink=0.8)
+        cbar = fig.colorbar(im, ax=ax, shrink=0.8)
         cbar.set_label('Co-occurrence Count', fontsize=10)
         
         # Add value annotations
@@ -432,7 +753,7 @@ class SemanticNetwork:
         ax.set_title('Co-occurrence Heatmap: Top 15 Entities and Themes', 
                      fontsize=14, fontweight='bold')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         return fig
     
@@ -446,7 +767,8 @@ class SemanticNetwork:
         setup_style()
         
         if self.graph is None or self.graph.number_of_nodes() == 0:
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig = Figure(figsize=(10, 6))
+            ax = fig.subplots()
             ax.text(0.5, 0.5, 'No network data available', ha='center', va='center')
             ax.axis('off')
             return fig
@@ -454,7 +776,8 @@ class SemanticNetwork:
         G = self.graph
         degrees = [d for n, d in G.degree()]
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        fig = Figure(figsize=(12, 5))
+        ax1, ax2 = fig.subplots(1, 2)
         
         # Histogram
         ax1.hist(degrees, bins=range(max(degrees)+2), color=COLORS['entity'], 
@@ -487,7 +810,7 @@ class SemanticNetwork:
         ]
         ax2.legend(handles=legend_elements, loc='lower right', fontsize=9)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         return fig
     
@@ -531,23 +854,14 @@ class SemanticNetwork:
         # Generate visualizations
         print("[5/5] Generating visualizations...")
         
-        # Figure 1: Network graph
-        fig1 = self.plot_network()
-        fig1_paths = save_figure(fig1, self.output_dir / 'figures' / 'exp3_semantic_network')
-        plt.close(fig1)
-        print(f"  - Saved: {fig1_paths}")
-        
-        # Figure 2: Co-occurrence heatmap
-        fig2 = self.plot_co_occurrence_heatmap()
-        fig2_paths = save_figure(fig2, self.output_dir / 'figures' / 'exp3_cooccurrence_heatmap')
-        plt.close(fig2)
-        print(f"  - Saved: {fig2_paths}")
-        
-        # Figure 3: Degree distribution
-        fig3 = self.plot_degree_distribution()
-        fig3_paths = save_figure(fig3, self.output_dir / 'figures' / 'exp3_degree_distribution')
-        plt.close(fig3)
-        print(f"  - Saved: {fig3_paths}")
+        figures = [
+            (self.plot_network, 'exp3_semantic_network'),                 # Figure 1
+            (self.plot_co_occurrence_heatmap, 'exp3_cooccurrence_heatmap'),  # Figure 2
+            (self.plot_degree_distribution, 'exp3_degree_distribution'),   # Figure 3
+        ]
+        figure_paths = save_figures(figures, self.output_dir / 'figures')
+        for paths in figure_paths:
+            print(f"  - Saved: {paths}")
         
         # Save tables and metrics
         print("  Saving tables and metrics...")
@@ -583,7 +897,7 @@ class SemanticNetwork:
         
         return {
             'metrics': metrics,
-            'figures': fig1_paths + fig2_paths + fig3_paths,
+            'figures': [path for paths in figure_paths for path in paths],
             'tables': [md_path, csv_path] if md_path else [],
             'metrics_file': str(metrics_path)
         }
@@ -17,20 +17,26 @@ Method:
 5. Visualize semantic drift
 """
 
+import re
 import json
+import functools
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-from collections import defaultdict
 
 from .visualization import (
     create_figure, save_figure, add_source_annotation,
     save_table_markdown, save_table_csv,
     COLORS, get_context_color, setup_style
 )
-from .parsers import EventDumpParser, load_json_data, save_json_data
+from .parsers import load_dialogues, load_json_data, save_json_data
+
+try:
+    import ahocorasick  # Optional: single-pass multi-keyword matching
+except ImportError:
+    ahocorasick = None
 
 
 class MotifEvolution:
@@ -44,6 +50,7 @@ class MotifEvolution:
         motif: Target motif to track (default: "小红帽")
         context_keywords: Dictionary of context categories and their keywords
         instances: List of motif instance dictionaries with context scores
+        instances_df: Columnar view of instances used by the aggregations
         evolution_df: DataFrame showing context evolution across arcs
     """
     
@@ -60,9 +67,40 @@ class MotifEvolution:
         self.output_dir = Path(__file__).parent.parent / 'outputs'
         
         self.context_keywords: Dict[str, List[str]] = {}
+        self._categories: Tuple[str, ...] = ()
         self.instances: List[Dict[str, Any]] = []
+        self._motif_dirty = True  # Instances out of date for motif/keywords
+        self.instances_df: Optional[pd.DataFrame] = None
         self.evolution_df: Optional[pd.DataFrame] = None
-        
+        self._automaton = None  # Aho-Corasick matcher over all context keywords
+        self._keyword_re = None  # Regex matcher used when pyahocorasick is missing
+        self._keywords: List[str] = []  # Distinct keywords, one occurrence column each
+        self._keyword_index: Dict[str, int] = {}
+        self._keyword_weights = np.zeros((0, 0), dtype=np.int32)  # keyword x category
+        self._prefix_keywords: List[str] = []
+        
+    @property
+    def motif(self) -> str:
+        """Target motif; changing it marks extracted instances as stale."""
+        return self._motif
+    
+    @motif.setter
+    def motif(self, value: str):
+        self._motif = value
+        self._motif_dirty = True
+    
+    @property
+    def instances(self) -> List[Dict[str, Any]]:
+        """Motif instances; assigning a list drops derived frames and marks it current."""
+        return self._instances
+    
+    @instances.setter
+    def instances(self, value: List[Dict[str, Any]]):
+        self._instances = value
+        self.instances_df = None
+        self.evolution_df = None
+        self._motif_dirty = False
+    
     def load_context_keywords(self):
         """Load context keyword sets from context_keywords.json."""
         context_path = self.data_dir / 'context_keywords.json'
@@ -74,10 +112,52 @@ class MotifEvolution:
             'posthuman': ['血', '病毒', '基因', '吸血鬼', '感染', '培育', '死']
         })
         
+        self._build_matchers()
+        self._motif_dirty = True
+        
         print(f"Loaded context keywords:")
         for category, keywords in self.context_keywords.items():
             print(f"  - {category}: {len(keywords)} keywords")
     
+    def _build_matchers(self):
+        """Index keywords and build the matcher for the current context_keywords."""
+        self._categories = tuple(self.context_keywords)
+        
+        # One occurrence column per distinct keyword; the weight matrix counts
+        # how often each keyword is listed per category, so duplicates score
+        # like the `in` scan
+        self._keyword_index = {}
+        for keywords in self.context_keywords.values():
+            for kw in keywords:
+                self._keyword_index.setdefault(kw, len(self._keyword_index))
+        self._keywords = list(self._keyword_index)
+        self._keyword_weights = np.zeros((len(self._keywords), len(self._categories)),
+                                         dtype=np.int32)
+        for c, keywords in enumerate(self.context_keywords.values()):
+            for kw in keywords:
+                self._keyword_weights[self._keyword_index[kw], c] += 1
+        
+        self._automaton = None
+        self._keyword_re = None
+        self._prefix_keywords = []
+        keywords = self._keywords
+        if keywords and '' not in self._keyword_index:
+            if ahocorasick is not None:
+                self._automaton = ahocorasick.Automaton()
+                for kw, col in self._keyword_index.items():
+                    self._automaton.add_word(kw, col)
+                self._automaton.make_automaton()
+            else:
+                # Fallback: one lookahead alternation reports a match at every
+                # start position, so overlapping keywords are found; keywords
+                # that are a prefix of a longer one are tested separately
+                by_length = sorted(keywords, key=len, reverse=True)
+                self._keyword_re = re.compile(
+                    '(?=(' + '|'.join(re.escape(kw) for kw in by_length) + '))'
+                )
+                self._prefix_keywords = [kw for kw in keywords
+                                         if any(o != kw and o.startswith(kw) for o in keywords)]
+    
     def extract_instances(self) -> List[Dict[str, Any]]:
         """
         Extract all instances of the motif from game dialogue.
@@ -86,36 +166,33 @@ class MotifEvolution:
             List of instance dictionaries with context scores
         """
         # Parse event dump
-        parser = EventDumpParser()
-        parser.parse_file(str(self.data_dir / 'EventTextDump.txt'))
-        dialogues = parser.extract_all_dialogue()
-        
-        self.instances = []
-        
-        for dialogue in dialogues:
-            text = dialogue.get('text', '') or ''
-            
-            # Check if motif is present
-            if self.motif not in text:
-                continue
-            
-            # Score contexts
-            scores = {}
-            for category, keywords in self.context_keywords.items():
-                score = sum(1 for kw in keywords if kw in text)
-                scores[category] = score
-            
-            # Determine dominant context
-            total = sum(scores.values())
-            if total > 0:
-                dominant = max(scores, key=scores.get)
-            else:
-                dominant = 'neutral'
+        dialogues = load_dialogues(str(self.data_dir / 'EventTextDump.txt'))
+        
+        instances = []
+        
+        # Keep only lines containing the motif before any per-line work
+        motif = self.motif
+        candidates = [(dialogue, text) for dialogue in dialogues
+                      if motif in (text := dialogue.get('text', '') or '')]
+        
+        # Score contexts for all candidates at once: number of each
+        # category's keywords present
+        categories = self._categories
+        score_matrix = self._score_matrix([text for _, text in candidates])
+        totals = score_matrix.sum(axis=1)
+        # Dominant context per row (argmax takes the first of tied maxima)
+        winners = (score_matrix.argmax(axis=1) if categories
+                   else np.zeros(len(candidates), dtype=np.intp))
+        
+        for (dialogue, text), row, total, winner in zip(candidates, score_matrix.tolist(),
+                                                        totals.tolist(), winners.tolist()):
+            scores = dict(zip(categories, row))
+            dominant = categories[winner] if total > 0 else 'neutral'
             
             # Determine arc from map_id
             arc = self._map_to_arc(dialogue['map_id'])
             
-            self.instances.append({
+            instances.append({
                 'map_id': dialogue['map_id'],
                 'map_name': dialogue['map_name'],
                 'event_id': dialogue['event_id'],
@@ -127,12 +204,93 @@ class MotifEvolution:
                 'total_context_score': total
             })
         
+        self.instances = instances
+        self.instances_df = self._instances_frame(instances)
+        self._motif_dirty = False
+        
         print(f"Found {len(self.instances)} motif instances")
         return self.instances
     
-    def _map_to_arc(self, map_id: int) -> str:
+    @staticmethod
+    def _instances_frame(instances: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Build a typed columnar DataFrame from instance dictionaries.
+        
+        Arcs are categorical in sorted order and contexts in order of first
+        appearance, so groupby/value_counts keep the list-based ordering.
+        
+        Args:
+            instances: Instance dictionaries from extract_instances
+            
+        Returns:
+            DataFrame with one row per instance
+        """
+        arcs = [inst['arc'] for inst in instances]
+        contexts = [inst['dominant_context'] for inst in instances]
+        context_order = list(dict.fromkeys(contexts))
+        return pd.DataFrame({
+            'map_id': np.array([inst['map_id'] for inst in instances], dtype=np.int32),
+            'map_name': [inst['map_name'] for inst in instances],
+            'event_id': [inst['event_id'] for inst in instances],
+            'line': np.array([inst['line'] for inst in instances], dtype=np.int32),
+            'text': [inst['text'] for inst in instances],
+            'arc': pd.Categorical(arcs, categories=sorted(set(arcs))),
+            'dominant_context': pd.Categorical(contexts, categories=context_order),
+            'total_context_score': np.array([inst['total_context_score'] for inst in instances],
+                                            dtype=np.int32),
+        })
+    
+    def _occurrences(self, texts: List[str]) -> np.ndarray:
         """
-        Determine narrative arc from map ID.
+        Build a boolean text x keyword matrix of keyword presence.
+        
+        Uses the Aho-Corasick automaton when pyahocorasick is installed,
+        else one compiled regex alternation; both take a single
+        pass over each text with overlapping matches included. Neither
+        matcher is built when there are no keywords or one keyword is the
+        empty string; only then is each column filled by np.char.find.
+        
+        Args:
+            texts: Dialogue texts
+            
+        Returns:
+            Boolean array of shape (len(texts), number of distinct keywords)
+        """
+        occurrences = np.zeros((len(texts), len(self._keywords)), dtype=bool)
+        if self._automaton is not None:
+            for i, text in enumerate(texts):
+                cols = [col for _, col in self._automaton.iter(text)]
+                occurrences[i, cols] = True
+        elif self._keyword_re is not None:
+            index = self._keyword_index
+            for i, text in enumerate(texts):
+                words = set(self._keyword_re.findall(text))
+                words.update(kw for kw in self._prefix_keywords if kw in text)
+                occurrences[i, [index[kw] for kw in words]] = True
+        elif texts:
+            array = np.array(texts, dtype=str)
+            for col, kw in enumerate(self._keywords):
+                occurrences[:, col] = np.char.find(array, kw) >= 0
+        return occurrences
+    
+    def _score_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        Count how many keywords of each context category occur in each text.
+        
+        Args:
+            texts: Dialogue texts
+            
+        Returns:
+            Integer array of shape (len(texts), number of categories), columns
+            in category order
+        """
+        return self._occurrences(texts).astype(np.int32) @ self._keyword_weights
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _map_to_arc(map_id: int) -> str:
+        """
+        Determine narrative arc from map ID (memoized; few distinct maps).
         
         This is based on the game's structure where:
         - Maps 1-45: Chapter 1 (Little Red)
@@ -168,37 +326,37 @@ class MotifEvolution:
         Returns:
             DataFrame with percentage breakdown by arc
         """
-        arc_contexts = defaultdict(lambda: defaultdict(int))
+        # Reuse the table until the motif, keywords or instances change
+        if self.evolution_df is not None and not self._motif_dirty:
+            return self.evolution_df
         
-        for instance in self.instances:
-            arc = instance['arc']
-            context = instance['dominant_context']
-            arc_contexts[arc][context] += 1
+        if not self.instances:
+            self.evolution_df = pd.DataFrame()
+            return self.evolution_df
         
-        # Convert to percentages
-        evolution_data = []
+        if self.instances_df is None:
+            self.instances_df = self._instances_frame(self.instances)
         
-        for arc in sorted(arc_contexts.keys()):
-            counts = arc_contexts[arc]
-            total = sum(counts.values())
-            
-            row = {
-                'Arc': arc,
-                'Innocence %': round((counts.get('innocence', 0) / total * 100), 1) if total > 0 else 0,
-                'Military %': round((counts.get('military', 0) / total * 100), 1) if total > 0 else 0,
-                'Posthuman %': round((counts.get('posthuman', 0) / total * 100), 1) if total > 0 else 0,
-                'Neutral %': round((counts.get('neutral', 0) / total * 100), 1) if total > 0 else 0,
-                'Total Instances': total
-            }
-            
-            # Determine dominant context for this arc
-            contexts = ['innocence', 'military', 'posthuman', 'neutral']
-            dominant = max(contexts, key=lambda c: counts.get(c, 0))
-            row['Dominant Context'] = dominant.title()
-            
-            evolution_data.append(row)
+        # Instance counts per (arc, context) in one pass; arcs in sorted order
+        counts = (self.instances_df.groupby(['arc', 'dominant_context'], observed=True)
+                  .size().unstack(fill_value=0))
+        total = counts.sum(axis=1)
         
-        self.evolution_df = pd.DataFrame(evolution_data)
+        # Convert to percentages
+        contexts = ['innocence', 'military', 'posthuman', 'neutral']
+        tracked = counts.reindex(columns=contexts, fill_value=0)
+        pct = tracked.div(total, axis=0).mul(100).round(1)
+        
+        self.evolution_df = pd.DataFrame({
+            'Arc': counts.index.to_numpy(),
+            'Innocence %': pct['innocence'].to_numpy(),
+            'Military %': pct['military'].to_numpy(),
+            'Posthuman %': pct['posthuman'].to_numpy(),
+            'Neutral %': pct['neutral'].to_numpy(),
+            'Total Instances': total.to_numpy(),
+            # Dominant context for each arc (first of the tied maxima)
+            'Dominant Context': tracked.idxmax(axis=1).str.title().to_numpy(),
+        })
         return self.evolution_df
     
     def get_metrics(self) -> Dict[str, Any]:
@@ -208,7 +366,8 @@ class MotifEvolution:
         Returns:
             Dictionary of metrics
         """
-        if not self.instances:
+        # Keep caller-supplied instances unless motif/keywords changed since
+        if not self.instances or self._motif_dirty:
             self.extract_instances()
         
         if self.evolution_df is None:
@@ -222,13 +381,13 @@ class MotifEvolution:
         }
         
         # Context distribution across all instances
-        context_totals = defaultdict(int)
-        for inst in self.instances:
-            context_totals[inst['dominant_context']] += 1
+        if self.instances_df is None:
+            self.instances_df = self._instances_frame(self.instances)
+        context_totals = self.instances_df['dominant_context'].value_counts(sort=False)
         
-        total = sum(context_totals.values())
+        total = int(context_totals.sum())
         for context, count in context_totals.items():
-            metrics[f'{context}_total_pct'] = round(count / total * 100, 2) if total > 0 else 0
+            metrics[f'{context}_total_pct'] = round(int(count) / total * 100, 2) if total > 0 else 0
         
         # Semantic shift analysis
         if self.evolution_df is not None and len(self.evolution_df) >= 2:
@@ -274,13 +433,12 @@ class MotifEvolution:
         
         x = range(len(df))
         
-        # Stack the context percentages
-        innocence = df['Innocence %'].values
-        military = df['Military %'].values
-        posthuman = df['Posthuman %'].values
-        neutral = df['Neutral %'].values
+        # Stack the context percentages (one row per context)
+        y_stack = np.ascontiguousarray(
+            df[['Innocence %', 'Military %', 'Posthuman %', 'Neutral %']]
+            .to_numpy(dtype=np.float64).T)
         
-        ax.stackplot(x, innocence, military, posthuman, neutral,
+        ax.stackplot(x, y_stack,
                     labels=['Innocence', 'Military', 'Posthuman', 'Neutral'],
                     colors=[COLORS['innocence'], COLORS['military'], 
                            COLORS['posthuman'], COLORS['neutral']],
@@ -296,8 +454,8 @@ class MotifEvolution:
         ax.legend(loc='upper left', fontsize=10)
         
         # Add instance count annotations
-        for i, row in df.iterrows():
-            ax.annotate(f'n={row["Total Instances"]}', 
+        for i, total in enumerate(df['Total Instances'].tolist()):
+            ax.annotate(f'n={total}', 
                        (i, 5), 
                        ha='center', 
                        fontsize=8,
@@ -476,29 +634,31 @@ class MotifEvolution:
         
         fig, ax = plt.subplots(figsize=(14, 4))
         
+        if self.instances_df is None:
+            self.instances_df = self._instances_frame(self.instances)
+        
         # Sort instances by line number (proxy for narrative order)
-        sorted_instances = sorted(self.instances, key=lambda x: x['line'])
+        sorted_instances = self.instances_df.sort_values('line', kind='stable')
         
         x = range(len(sorted_instances))
-        colors = [get_context_color(inst['dominant_context']) for inst in sorted_instances]
+        # One color lookup per context category, gathered by categorical code
+        contexts = sorted_instances['dominant_context'].cat
+        palette = np.array([get_context_color(c) for c in contexts.categories])
+        colors = palette[contexts.codes.to_numpy()]
         
         # Scatter plot of instances
         ax.scatter(x, [1]*len(x), c=colors, s=50, alpha=0.7, edgecolor='white')
         
-        # Add arc boundaries
-        prev_arc = None
-        arc_boundaries = []
-        for i, inst in enumerate(sorted_instances):
-            if inst['arc'] != prev_arc:
-                arc_boundaries.append((i, inst['arc']))
-                prev_arc = inst['arc']
+        # Add arc boundaries wherever the arc code changes
+        arcs = sorted_instances['arc'].cat
+        arc_codes = arcs.codes.to_numpy()
+        starts = np.concatenate(([0], np.flatnonzero(arc_codes[1:] != arc_codes[:-1]) + 1))
+        ends = np.append(starts[1:], len(arc_codes))
+        arc_labels = arcs.categories[arc_codes[starts]]
         
-        for i, (boundary, arc) in enumerate(arc_boundaries):
+        for boundary, end, arc in zip(starts.tolist(), ends.tolist(), arc_labels):
             ax.axvline(x=boundary, color='gray', linestyle='--', alpha=0.5)
-            if i < len(arc_boundaries) - 1:
-                mid = (boundary + arc_boundaries[i+1][0]) / 2
-            else:
-                mid = (boundary + len(sorted_instances)) / 2
+            mid = (boundary + end) / 2
             ax.text(mid, 1.3, arc, ha='center', va='bottom', fontsize=9, rotation=30)
         
         ax.set_xlim(-1, len(sorted_instances))
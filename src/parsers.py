@@ -9,12 +9,98 @@ These parsers extract structured data suitable for computational humanities anal
 """
 
 import re
+import os
 import json
+import functools
+from bisect import bisect_right
+from itertools import accumulate
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-from collections import defaultdict
+from collections import Counter, defaultdict
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson  # Optional: Rust-backed JSON, falls back to stdlib json
+except ImportError:
+    orjson = None
+
+
+# Read size for streaming EventTextDump.txt (1 MiB per read call)
+EVENT_DUMP_CHUNK = 1 << 20
+
+# Files up to this size (64 MiB) are read and split in one call instead
+EVENT_DUMP_READ_ALL = 64 << 20
+
+# narrative_extraction.md headers, dialogue, beats and sequence metadata.
+# Line-anchored patterns run over the whole document, so they are MULTILINE
+# and use [^\S\n] where whitespace must not run on to the next line
+_CHAPTER_RE = re.compile(r'^## CHAPTER (\d+)[:：]?[^\S\n]*(.+)?$', re.MULTILINE)
+_ARC_RE = re.compile(r'^### Arc (\d+\.\d+)[:：]?[^\S\n]*(.+)?$', re.MULTILINE)
+_SEQ_RE = re.compile(r'^#### Sequence (\d+\.\d+\.\d+)[:：]?[^\S\n]*(.+)?$', re.MULTILINE)
+_DIALOGUE_RE = re.compile(r'「(.+?)」')
+_BEAT_RE = re.compile(r'^\d+\.[^\S\n]*\*\*(.+?)\*\*', re.MULTILINE)
+_LOC_RE = re.compile(r'\*\*Location:\*\*\s*(.+)')
+_MAP_RE = re.compile(r'Map (\d+)')
+_EVENT_RE = re.compile(r'Event (\d+)')
+_SOURCE_RE = re.compile(r'\*\*Source:\*\*\s*Lines?\s*(\d+)(?:-(\d+))?')
+_SPEAKER_DASH_RE = re.compile(r'[—–-]\s*(.+)')
+_SPEAKER_COLON_RE = re.compile(r'^>\s*(.+?)[:：]\s*$')
+
+
+def _split_command(line: str) -> Tuple[str, str]:
+    """
+    Split an EventTextDump.txt command line into type and content.
+    
+    Lines look like "@>CommandType: content" or "@>CommandType"; the type
+    runs up to the first colon.
+    
+    Args:
+        line: Command line starting with @>, surrounding whitespace stripped
+        
+    Returns:
+        Tuple of (command type or 'Unknown' if empty, content or '')
+    """
+    head, sep, tail = line[2:].partition(':')
+    if not head:
+        return 'Unknown', ''
+    return head.strip(), tail.strip() if sep else ''
+
+
+def _iter_lines(filepath: str, chunk_size: int = EVENT_DUMP_CHUNK):
+    """
+    Yield lines of a UTF-8 text file.
+    
+    Files up to EVENT_DUMP_READ_ALL bytes are decoded and split at once;
+    larger ones are read in fixed-size chunks to bound memory. Lines are
+    split on newlines only (not str.splitlines' extra separators), so line
+    numbers match the file either way.
+    
+    Args:
+        filepath: Path to text file
+        chunk_size: Number of characters per read call when streaming
+        
+    Yields:
+        Lines without their trailing newline
+    """
+    if os.path.getsize(filepath) <= EVENT_DUMP_READ_ALL:
+        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().split('\n')
+        if lines[-1] == '':
+            lines.pop()
+        yield from lines
+        return
+    
+    with open(filepath, 'r', encoding='utf-8', errors='replace',
+              buffering=chunk_size) as f:
+        tail = ''
+        for chunk in iter(lambda: f.read(chunk_size), ''):
+            lines = (tail + chunk).split('\n')
+            tail = lines.pop()
+            yield from lines
+        if tail:
+            yield tail
+
 
 class EventDumpParser:
     """
@@ -45,9 +131,19 @@ class EventDumpParser:
         'Other': []  # Fallback category
     }
     
+    # Raw command type -> category, filled on first sight of each type
+    _NORMALIZE_CACHE: Dict[str, str] = {}
+    
+    # Narrative density bands: <= 0.3, (0.3, 0.7], > 0.7
+    DENSITY_THRESHOLDS = np.array([0.3, 0.7])
+    DENSITY_CLASSES = ('Combat/Traversal', 'Mixed', 'Story-Heavy')
+    
     def __init__(self):
         """Initialize parser with empty map list."""
         self.maps: List[Dict[str, Any]] = []
+        # (map index, map, event, command) for every command, in file order
+        self._command_refs: List[Tuple[int, Dict[str, Any], Dict[str, Any], Dict[str, Any]]] = []
+        self._cmd_df: Optional[pd.DataFrame] = None
         
     def parse_file(self, filepath: str) -> List[Dict[str, Any]]:
         """
@@ -63,13 +159,21 @@ class EventDumpParser:
             - events: List of event dictionaries with commands
         """
         self.maps = []
+        self._command_refs = []
+        self._cmd_df = None
+        command_refs = self._command_refs
         current_map = None
         current_event = None
-        
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.rstrip('\n\r')
-                
+        # Text command receiving continuation lines, and its content parts;
+        # joined once instead of growing the string per line
+        open_text = None
+        open_parts: List[str] = []
+        
+        for line_num, line in enumerate(_iter_lines(filepath), 1):
+            # Header lines start at column 0, so their first character picks
+            # the only prefixes worth testing
+            first = line[:1]
+            if first == 'M':
                 # Detect map headers: "Map ID: 001"
                 if line.startswith("Map ID:"):
                     map_id = int(line.split(':')[1].strip())
@@ -83,9 +187,11 @@ class EventDumpParser:
                 # Detect map names: "Map Name: 营地"
                 elif line.startswith("Map Name:") and current_map is not None:
                     current_map['name'] = line.split(':', 1)[1].strip()
-                    
+                continue
+            
+            if first == 'E':
                 # Detect events: "Event ID: 006"
-                elif line.startswith("Event ID:") and current_map is not None:
+                if line.startswith("Event ID:") and current_map is not None:
                     event_id = int(line.split(':')[1].strip())
                     current_event = {
                         'id': event_id,
@@ -97,25 +203,39 @@ class EventDumpParser:
                 # Detect event names
                 elif line.startswith("Event Name:") and current_event is not None:
                     current_event['name'] = line.split(':', 1)[1].strip()
-                    
-                # Detect commands: "@>Text:", "@>Battle Processing:", etc.
-                elif line.strip().startswith("@>") and current_event is not None:
-                    cmd_type = self._extract_command_type(line)
-                    content = self._extract_content(line)
-                    current_event['commands'].append({
-                        'type': cmd_type,
-                        'normalized_type': self._normalize_type(cmd_type),
-                        'line': line_num,
-                        'content': content,
-                        'raw': line.strip()
-                    })
-                    
-                # Detect dialogue continuation lines
-                elif line.strip().startswith(':    :') and current_event is not None:
-                    if current_event['commands'] and current_event['commands'][-1]['type'] == 'Text':
-                        # Append to previous text command's content
-                        current_event['commands'][-1]['content'] += '\n' + line.strip()[6:].strip()
-                        
+                continue
+            
+            if current_event is None:
+                continue
+            stripped = line.strip()
+            
+            # Detect commands: "@>Text:", "@>Battle Processing:", etc.
+            if stripped.startswith("@>"):
+                cmd_type, content = _split_command(stripped)
+                cmd = {
+                    'type': cmd_type,
+                    'normalized_type': self._normalize_type(cmd_type),
+                    'line': line_num,
+                    'content': content,
+                    'raw': stripped
+                }
+                current_event['commands'].append(cmd)
+                command_refs.append((len(self.maps) - 1, current_map, current_event, cmd))
+                
+            # Detect dialogue continuation lines
+            elif stripped.startswith(':    :'):
+                if current_event['commands'] and current_event['commands'][-1]['type'] == 'Text':
+                    # Append to previous text command's content
+                    last = current_event['commands'][-1]
+                    if last is not open_text:
+                        if open_text is not None:
+                            open_text['content'] = '\n'.join(open_parts)
+                        open_text, open_parts = last, [last['content']]
+                    open_parts.append(stripped[6:].strip())
+        
+        if open_text is not None:
+            open_text['content'] = '\n'.join(open_parts)
+        
         return self.maps
     
     def _extract_command_type(self, line: str) -> str:
@@ -123,32 +243,24 @@ class EventDumpParser:
         Extract command type from @> line.
         
         Args:
-            line: Raw line starting with @>
+            line: Command line starting with @>, surrounding whitespace stripped
             
         Returns:
             Command type string (e.g., 'Text', 'Battle Processing')
         """
-        # Pattern: @>CommandType: content or @>CommandType
-        match = re.match(r'@>([^:]+)(?::|$)', line.strip())
-        if match:
-            return match.group(1).strip()
-        return 'Unknown'
+        return _split_command(line)[0]
     
     def _extract_content(self, line: str) -> str:
         """
         Extract content after command type.
         
         Args:
-            line: Raw line starting with @>
+            line: Command line starting with @>, surrounding whitespace stripped
             
         Returns:
             Content string (may be empty)
         """
-        # Find first colon after @> and extract content
-        match = re.match(r'@>[^:]+:\s*(.*)', line.strip())
-        if match:
-            return match.group(1).strip()
-        return ''
+        return _split_command(line)[1]
     
     def _normalize_type(self, cmd_type: str) -> str:
         """
@@ -160,11 +272,54 @@ class EventDumpParser:
         Returns:
             Normalized category (Text, Battle, Logic, Navigation, etc.)
         """
+        # Only a few dozen distinct raw types occur, so scan each once
+        category = self._NORMALIZE_CACHE.get(cmd_type)
+        if category is None:
+            category = self._NORMALIZE_CACHE[cmd_type] = self._scan_command_types(cmd_type)
+        return category
+    
+    def _scan_command_types(self, cmd_type: str) -> str:
+        """
+        Find the first category with a pattern contained in cmd_type.
+        
+        Args:
+            cmd_type: Raw command type string
+            
+        Returns:
+            Normalized category, or 'Other' if no pattern matches
+        """
         for category, patterns in self.COMMAND_TYPES.items():
             if any(p in cmd_type for p in patterns):
                 return category
         return 'Other'
     
+    def _commands_frame(self) -> pd.DataFrame:
+        """
+        Flat table of all parsed commands, built on first use.
+        
+        Built lazily from references kept by parse_file, so dialogue
+        continuation lines appended after a command are included.
+        
+        Returns:
+            DataFrame with one row per command: map_idx (position in maps),
+            map_id, map_name, event_id, event_name, normalized_type, line,
+            content, raw
+        """
+        if self._cmd_df is None:
+            refs = self._command_refs
+            self._cmd_df = pd.DataFrame({
+                'map_idx': np.array([r[0] for r in refs], dtype=np.int64),
+                'map_id': np.array([m['id'] for _, m, _, _ in refs], dtype=np.int64),
+                'map_name': [m['name'] for _, m, _, _ in refs],
+                'event_id': np.array([e['id'] for _, _, e, _ in refs], dtype=np.int64),
+                'event_name': [e['name'] for _, _, e, _ in refs],
+                'normalized_type': [c['normalized_type'] for _, _, _, c in refs],
+                'line': np.array([c['line'] for _, _, _, c in refs], dtype=np.int64),
+                'content': [c['content'] for _, _, _, c in refs],
+                'raw': [c['raw'] for _, _, _, c in refs],
+            })
+        return self._cmd_df
+    
     def count_commands_by_map(self) -> pd.DataFrame:
         """
         Count commands by type for each map.
@@ -175,40 +330,68 @@ class EventDumpParser:
             - dialogue_count, battle_count, logic_count, navigation_count
             - total_commands, narrative_density, classification
         """
-        data = []
+        if not self.maps:
+            return pd.DataFrame()
+        
+        # Commands per (map, category) in one groupby; maps without
+        # commands get a row of zeros
+        n_maps = len(self.maps)
+        commands = self._commands_frame()
+        counts = (commands.groupby(['map_idx', 'normalized_type']).size()
+                  .unstack(fill_value=0)
+                  .reindex(index=range(n_maps), fill_value=0))
+        
+        def count(*categories: str) -> np.ndarray:
+            total = np.zeros(n_maps, dtype=np.int64)
+            for category in categories:
+                if category in counts:
+                    total += counts[category].to_numpy(dtype=np.int64)
+            return total
+        
+        dialogue = count('Text')
+        battle = count('Battle', 'Common')  # Common events often trigger battles
+        logic = count('Logic')
+        navigation = count('Navigation')
+        visual = count('Visual', 'Audio')
+        other = count('Other', 'Message', 'Wait', 'Party')
+        
+        df = pd.DataFrame({
+            'map_id': [m['id'] for m in self.maps],
+            'map_name': [m['name'] for m in self.maps],
+            'dialogue_count': dialogue,
+            'battle_count': battle,
+            'logic_count': logic,
+            'navigation_count': navigation,
+            'visual_audio_count': visual,
+            'other_count': other,
+            'total_commands': dialogue + battle + logic + navigation + visual + other,
+        })
+        
+        # Density and classification for all maps at once
+        dialogue = df['dialogue_count'].to_numpy(dtype=float)
+        total = df['total_commands'].to_numpy(dtype=float)
+        density = np.divide(dialogue, total, out=np.zeros_like(dialogue), where=total > 0)
+        
+        df['narrative_density'] = np.round(density, 4)
+        df['classification'] = self._classify_densities(density)
+        
+        return df
+    
+    def _classify_densities(self, densities: np.ndarray) -> np.ndarray:
+        """
+        Classify an array of narrative densities.
         
-        for m in self.maps:
-            counts = defaultdict(int)
-            
-            for event in m['events']:
-                for cmd in event['commands']:
-                    counts[cmd['normalized_type']] += 1
-            
-            dialogue = counts.get('Text', 0)
-            battle = counts.get('Battle', 0) + counts.get('Common', 0)  # Common events often trigger battles
-            logic = counts.get('Logic', 0)
-            navigation = counts.get('Navigation', 0)
-            visual = counts.get('Visual', 0) + counts.get('Audio', 0)
-            other = counts.get('Other', 0) + counts.get('Message', 0) + counts.get('Wait', 0) + counts.get('Party', 0)
-            
-            total = dialogue + battle + logic + navigation + visual + other
-            density = dialogue / total if total > 0 else 0
-            
-            data.append({
-                'map_id': m['id'],
-                'map_name': m['name'],
-                'dialogue_count': dialogue,
-                'battle_count': battle,
-                'logic_count': logic,
-                'navigation_count': navigation,
-                'visual_audio_count': visual,
-                'other_count': other,
-                'total_commands': total,
-                'narrative_density': round(density, 4),
-                'classification': self._classify_density(density)
-            })
+        Vectorized equivalent of _classify_density: thresholds are exclusive
+        lower bounds, so a density of exactly 0.3 is still Combat/Traversal.
         
-        return pd.DataFrame(data)
+        Args:
+            densities: Narrative density values (0.0 to 1.0)
+            
+        Returns:
+            Array of classification strings
+        """
+        codes = np.searchsorted(self.DENSITY_THRESHOLDS, densities, side='left')
+        return np.array(self.DENSITY_CLASSES, dtype=object)[codes]
     
     def _classify_density(self, density: float) -> str:
         """
@@ -234,23 +417,11 @@ class EventDumpParser:
         Returns:
             List of dialogue dictionaries with map/event context
         """
-        dialogues = []
-        
-        for m in self.maps:
-            for event in m['events']:
-                for cmd in event['commands']:
-                    if cmd['normalized_type'] == 'Text':
-                        dialogues.append({
-                            'map_id': m['id'],
-                            'map_name': m['name'],
-                            'event_id': event['id'],
-                            'event_name': event['name'],
-                            'line': cmd['line'],
-                            'text': cmd['content'],
-                            'raw': cmd['raw']
-                        })
-        
-        return dialogues
+        commands = self._commands_frame()
+        text = commands.loc[commands['normalized_type'] == 'Text',
+                            ['map_id', 'map_name', 'event_id', 'event_name',
+                             'line', 'content', 'raw']]
+        return text.rename(columns={'content': 'text'}).to_dict('records')
     
     def get_map_summary(self) -> Dict[str, Any]:
         """
@@ -260,30 +431,15 @@ class EventDumpParser:
             Dictionary with total maps, events, commands, etc.
         """
         total_events = sum(len(m['events']) for m in self.maps)
-        total_commands = sum(
-            len(cmd) 
-            for m in self.maps 
-            for e in m['events'] 
-            for cmd in [e['commands']]
-        )
-        total_dialogue = sum(
-            1 for m in self.maps 
-            for e in m['events'] 
-            for cmd in e['commands'] 
-            if cmd['normalized_type'] == 'Text'
-        )
+        commands = self._commands_frame()
+        is_text = commands['normalized_type'] == 'Text'
         
         return {
             'total_maps': len(self.maps),
             'total_events': total_events,
-            'total_commands': sum(len(e['commands']) for m in self.maps for e in m['events']),
-            'total_dialogue_commands': total_dialogue,
-            'maps_with_dialogue': sum(
-                1 for m in self.maps 
-                if any(cmd['normalized_type'] == 'Text' 
-                       for e in m['events'] 
-                       for cmd in e['commands'])
-            )
+            'total_commands': len(commands),
+            'total_dialogue_commands': int(is_text.sum()),
+            'maps_with_dialogue': int(commands.loc[is_text, 'map_idx'].nunique())
         }
 
 
@@ -331,37 +487,48 @@ class NarrativeExtractionParser:
         current_sequence = None
         
         lines = content.split('\n')
-        i = 0
         
-        while i < len(lines):
-            line = lines[i]
-            
+        # One finditer pass per pattern over the whole document; each match
+        # is placed on its line by bisecting the line start offsets
+        line_starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
+        
+        def line_of(match: re.Match) -> int:
+            return bisect_right(line_starts, match.start()) - 1
+        
+        # Headers, then at most one dialogue per non-header line, then beats;
+        # sorting by (line, kind) reproduces a line-by-line scan
+        events = []
+        for kind, pattern in (('chapter', _CHAPTER_RE), ('arc', _ARC_RE), ('sequence', _SEQ_RE)):
+            events.extend((line_of(m), 0, kind, m) for m in pattern.finditer(content))
+        taken = {idx for idx, _, _, _ in events}
+        for m in _DIALOGUE_RE.finditer(content):
+            idx = line_of(m)
+            if idx not in taken:
+                taken.add(idx)
+                events.append((idx, 1, 'dialogue', m))
+        events.extend((line_of(m), 2, 'beat', m) for m in _BEAT_RE.finditer(content))
+        events.sort(key=lambda event: event[:2])
+        
+        for i, _, kind, match in events:
             # Chapter headers: "## CHAPTER 1: 小红帽"
-            chapter_match = re.match(r'^## CHAPTER (\d+)[:：]?\s*(.+)?$', line)
-            if chapter_match:
-                current_chapter = chapter_match.group(1)
-                i += 1
-                continue
+            if kind == 'chapter':
+                current_chapter = match.group(1)
             
             # Arc headers: "### Arc 1.1: Camp Departure"
-            arc_match = re.match(r'^### Arc (\d+\.\d+)[:：]?\s*(.+)?$', line)
-            if arc_match:
-                current_arc = arc_match.group(1)
-                arc_name = arc_match.group(2) if arc_match.group(2) else ''
+            elif kind == 'arc':
+                current_arc = match.group(1)
+                arc_name = match.group(2) if match.group(2) else ''
                 self.arcs.append({
                     'chapter': current_chapter,
                     'arc_id': current_arc,
                     'name': arc_name,
                     'sequences': []
                 })
-                i += 1
-                continue
             
             # Sequence headers: "#### Sequence 1.1.1: Awakening"
-            seq_match = re.match(r'^#### Sequence (\d+\.\d+\.\d+)[:：]?\s*(.+)?$', line)
-            if seq_match:
-                current_sequence = seq_match.group(1)
-                seq_name = seq_match.group(2) if seq_match.group(2) else ''
+            elif kind == 'sequence':
+                current_sequence = match.group(1)
+                seq_name = match.group(2) if match.group(2) else ''
                 
                 # Parse sequence block
                 sequence_data = self._parse_sequence_block(lines, i)
@@ -371,13 +538,10 @@ class NarrativeExtractionParser:
                         'name': seq_name,
                         **sequence_data
                     })
-                i += 1
-                continue
             
             # Dialogue extraction: 「...」 with speaker
-            dialogue_match = re.search(r'「(.+?)」', line)
-            if dialogue_match:
-                dialogue_text = dialogue_match.group(1)
+            elif kind == 'dialogue':
+                dialogue_text = match.group(1)
                 # Look for speaker on next line or same line
                 speaker = self._extract_speaker(lines, i)
                 
@@ -394,9 +558,8 @@ class NarrativeExtractionParser:
                     self.characters.add(speaker)
             
             # Beat extraction
-            beat_match = re.match(r'^\d+\.\s*\*\*(.+?)\*\*', line)
-            if beat_match:
-                beat_desc = beat_match.group(1)
+            else:
+                beat_desc = match.group(1)
                 self.beats.append({
                     'chapter': current_chapter,
                     'arc': current_arc,
@@ -404,8 +567,6 @@ class NarrativeExtractionParser:
                     'description': beat_desc,
                     'line_num': i + 1
                 })
-            
-            i += 1
         
         return self.beats
     
@@ -433,19 +594,19 @@ class NarrativeExtractionParser:
             line = lines[i]
             
             # Location: "**Location:** Map 001: 营地, Event 004"
-            loc_match = re.search(r'\*\*Location:\*\*\s*(.+)', line)
+            loc_match = _LOC_RE.search(line)
             if loc_match:
                 result['location'] = loc_match.group(1)
                 # Extract map and event IDs
-                map_match = re.search(r'Map (\d+)', result['location'])
-                event_match = re.search(r'Event (\d+)', result['location'])
+                map_match = _MAP_RE.search(result['location'])
+                event_match = _EVENT_RE.search(result['location'])
                 if map_match:
                     result['map_id'] = int(map_match.group(1))
                 if event_match:
                     result['event_id'] = int(event_match.group(1))
             
             # Source: "**Source:** Lines 143-158"
-            source_match = re.search(r'\*\*Source:\*\*\s*Lines?\s*(\d+)(?:-(\d+))?', line)
+            source_match = _SOURCE_RE.search(line)
             if source_match:
                 start = int(source_match.group(1))
                 end = int(source_match.group(2)) if source_match.group(2) else start
@@ -480,13 +641,13 @@ class NarrativeExtractionParser:
         # Check next line for "— Speaker" pattern
         if current_idx + 1 < len(lines):
             next_line = lines[current_idx + 1]
-            speaker_match = re.search(r'[—–-]\s*(.+)', next_line)
+            speaker_match = _SPEAKER_DASH_RE.search(next_line)
             if speaker_match:
                 return speaker_match.group(1).strip()
         
         # Check same line for "Speaker：" before dialogue
         current_line = lines[current_idx]
-        speaker_match = re.match(r'^>\s*(.+?)[:：]\s*$', current_line)
+        speaker_match = _SPEAKER_COLON_RE.match(current_line)
         if speaker_match:
             return speaker_match.group(1).strip()
         
@@ -512,25 +673,19 @@ class NarrativeExtractionParser:
         Returns:
             DataFrame with character, count, and arc distribution
         """
-        char_counts = defaultdict(lambda: {'total': 0, 'arcs': set()})
-        
+        totals = Counter(d['speaker'] for d in self.dialogues if d['speaker'])
+        char_arcs: Dict[str, set] = defaultdict(set)
         for d in self.dialogues:
-            if d['speaker']:
-                char_counts[d['speaker']]['total'] += 1
-                if d['arc']:
-                    char_counts[d['speaker']]['arcs'].add(d['arc'])
-        
-        data = [
-            {
-                'character': char,
-                'dialogue_count': info['total'],
-                'arc_count': len(info['arcs']),
-                'arcs': ', '.join(sorted(info['arcs']))
-            }
-            for char, info in char_counts.items()
-        ]
-        
-        return pd.DataFrame(data).sort_values('dialogue_count', ascending=False)
+            if d['speaker'] and d['arc']:
+                char_arcs[d['speaker']].add(d['arc'])
+        
+        df = pd.DataFrame({
+            'character': list(totals),
+            'dialogue_count': list(totals.values()),
+            'arc_count': [len(char_arcs.get(char, ())) for char in totals],
+            'arcs': [', '.join(sorted(char_arcs.get(char, ()))) for char in totals],
+        })
+        return df.sort_values('dialogue_count', ascending=False)
     
     def extract_all_text(self) -> str:
         """
@@ -570,28 +725,66 @@ class NarrativeExtractionParser:
         }
 
 
+@functools.lru_cache(maxsize=32)
+def _load_json_cached(filepath: str, mtime: float) -> Any:
+    """Parse a JSON file; cached on (path, modification time)."""
+    if orjson is not None:
+        return orjson.loads(Path(filepath).read_bytes())
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 def load_json_data(filepath: str) -> Dict[str, Any]:
     """
     Load JSON data file.
     
+    Results are cached per path and file modification time, so repeated
+    loads of an unchanged file skip re-parsing. The returned object is
+    shared between callers and should be treated as read-only.
+    
     Args:
         filepath: Path to JSON file
         
     Returns:
         Parsed JSON data
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    filepath = str(filepath)
+    return _load_json_cached(filepath, os.path.getmtime(filepath))
+
+
+def load_dialogues(filepath: str) -> List[Dict[str, Any]]:
+    """
+    Load all dialogue lines from an EventTextDump file.
+    
+    Args:
+        filepath: Path to EventTextDump.txt
+        
+    Returns:
+        List of dialogue dictionaries, as from EventDumpParser.extract_all_dialogue
+    """
+    parser = EventDumpParser()
+    parser.parse_file(str(filepath))
+    return parser.extract_all_dialogue()
 
 
 def save_json_data(data: Any, filepath: str) -> None:
     """
     Save data to JSON file.
     
+    Uses orjson when available (non-string keys and NumPy scalars are
+    serialized natively), otherwise the stdlib json module.
+    
     Args:
         data: Data to save
         filepath: Output path
     """
+    if orjson is not None:
+        Path(filepath).write_bytes(orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ))
+        return
+    
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
@@ -11,17 +11,37 @@ All figures follow DH publication standards:
 - Colorblind-friendly palettes
 """
 
+import matplotlib
+matplotlib.use('Agg')  # Headless: figures are only written to disk
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 import seaborn as sns
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Callable, Dict, List, Tuple, Optional, Any, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+import atexit
+import inspect
 import warnings
+import functools
+
+try:
+    import pyarrow as pa  # Optional: multi-threaded C++ CSV writer
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
 
 # Suppress matplotlib warnings
 warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
 
+# Cheaper Agg rendering for artist-heavy figures; figures are closed explicitly
+plt.rcParams.update({
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+    'figure.max_open_warning': 0,
+})
+
 # ============================================================================
 # STYLE CONFIGURATION
 # ============================================================================
@@ -55,6 +75,19 @@ COLORS = {
     'community_5': '#F39C12',
 }
 
+# Density classification -> color lookup (for vectorized Series.map)
+CLASSIFICATION_COLORS = {
+    'Story-Heavy': COLORS['story'],
+    'Mixed': COLORS['mixed'],
+    'Combat/Traversal': COLORS['combat'],
+}
+
+# Community index -> color, cycled by get_community_color
+COMMUNITY_COLORS = tuple(COLORS[f'community_{i}'] for i in range(1, 6))
+
+# Font chosen by setup_style(); None until the style is first applied
+_font: Optional[str] = None
+
 # Figure sizes (in inches)
 FIGURE_SIZES = {
     'single': (8, 6),         # Single column
@@ -64,20 +97,29 @@ FIGURE_SIZES = {
     'wide': (14, 6),          # Wide (timelines)
 }
 
+# Sizes above which bulk artists are rasterized in vector (PDF) output
+RASTERIZE_MIN_NODES = 200   # plot_network_graph edges
+RASTERIZE_MIN_POINTS = 200  # plot_stacked_area polygons
 
-def setup_style():
+# Background pool for async_io table writes (created on first use)
+_IO_POOL: Optional[ThreadPoolExecutor] = None
+_PENDING_IO: List[Future] = []
+
+# Graphs smaller than this get circular_layout under layout='auto'
+SMALL_GRAPH_NODES = 8
+
+
+@functools.lru_cache(maxsize=1)
+def _select_font() -> str:
     """
-    Configure matplotlib and seaborn for publication-quality figures.
+    Pick the preferred installed font for Chinese text.
     
-    Sets up:
-    - Seaborn whitegrid style
-    - Chinese-compatible fonts
-    - Default figure parameters
-    """
-    # Set seaborn style
-    sns.set_style("whitegrid")
+    Scans the font manager once per process; later calls return the
+    cached choice.
     
-    # Configure font handling for Chinese characters
+    Returns:
+        Font family name, 'DejaVu Sans' if no candidate is installed
+    """
     # Try multiple font options in order of preference
     font_candidates = [
         'WenQuanYi Zen Hei',      # Most commonly available CJK font
@@ -91,7 +133,7 @@ def setup_style():
     ]
     
     # Find available fonts
-    available_fonts = [f.name for f in fm.fontManager.ttflist]
+    available_fonts = {f.name for f in fm.fontManager.ttflist}
     
     selected_font = 'DejaVu Sans'  # Fallback
     for font in font_candidates:
@@ -99,6 +141,27 @@ def setup_style():
             selected_font = font
             break
     
+    return selected_font
+
+
+def _apply_style() -> str:
+    """
+    Configure matplotlib and seaborn for publication-quality figures.
+    
+    Sets up:
+    - Seaborn whitegrid style
+    - Chinese-compatible fonts
+    - Default figure parameters
+    
+    Returns:
+        Selected font family name
+    """
+    # Set seaborn style
+    sns.set_style("whitegrid")
+    
+    # Configure font handling for Chinese characters
+    selected_font = _select_font()
+    
     # Apply matplotlib settings
     plt.rcParams.update({
         'font.family': 'sans-serif',
@@ -118,9 +181,30 @@ def setup_style():
     return selected_font
 
 
+def setup_style():
+    """
+    Apply the publication style on first use and return its font.
+    
+    The font scan and rcParams update run once per process, so later
+    per-figure calls cost nothing. Later calls do not re-apply the style:
+    code that changes rcParams after the first call should do so inside
+    ``plt.rc_context()`` so the house style is restored afterwards.
+    Importing this module does not style anything, which keeps imports
+    for the color and table helpers cheap.
+    
+    Returns:
+        Selected font family name
+    """
+    global _font
+    if _font is None:
+        _font = _apply_style()
+    return _font
+
+
+@functools.lru_cache(maxsize=1)
 def get_chinese_font():
     """
-    Get a font path that supports Chinese characters.
+    Get a font path that supports Chinese characters (cached per process).
     
     Returns:
         Path to a Chinese-compatible font file, or None
@@ -219,17 +303,42 @@ def save_figure(fig: plt.Figure,
     for fmt in formats:
         filepath = output_path.with_suffix(f'.{fmt}')
         
-        dpi = 300 if fmt == 'png' else None
+        # 300 DPI also sets the resolution of rasterized artists inside PDFs
         fig.savefig(filepath, 
-                    dpi=dpi, 
+                    dpi=300, 
                     bbox_inches='tight',
                     facecolor='white',
-                    edgecolor='none')
+                    edgecolor='none',
+                    backend='pdf' if fmt == 'pdf' else None)
         saved_paths.append(str(filepath))
     
     return saved_paths
 
 
+def save_figures(figures: List[Tuple[Callable[[], plt.Figure], str]],
+                 output_dir: str) -> List[List[str]]:
+    """
+    Build figures in order, saving each on a worker thread.
+    
+    Each save overlaps with building the next figure. Pyplot is not
+    thread-safe, so the plot callables must build pyplot-free
+    ``matplotlib.figure.Figure`` objects (``Figure(...)`` plus
+    ``fig.subplots()``), never ``plt.subplots``.
+    
+    Args:
+        figures: (plot callable, output file stem) pairs
+        output_dir: Directory the figures are saved into
+        
+    Returns:
+        Saved paths per figure (see save_figure), in input order
+    """
+    output_dir = Path(output_dir)
+    with ThreadPoolExecutor(max_workers=max(len(figures), 1)) as executor:
+        pending = [executor.submit(save_figure, plot(), output_dir / name)
+                   for plot, name in figures]
+        return [save.result() for save in pending]
+
+
 def add_source_annotation(ax: plt.Axes, 
                           source_text: str = "Source: EventTextDump.txt analysis"):
     """
@@ -271,6 +380,8 @@ def plot_horizontal_bar_chart(data: Dict[str, float],
     Returns:
         Matplotlib axes
     """
+    setup_style()
+    
     if ax is None:
         fig, ax = create_figure('double')
     
@@ -283,7 +394,7 @@ def plot_horizontal_bar_chart(data: Dict[str, float],
         colors = [COLORS['mixed']] * len(labels)
     
     y_pos = np.arange(len(labels))
-    ax.barh(y_pos, values, color=colors, edgecolor='white', linewidth=0.5)
+    bars = ax.barh(y_pos, values, color=colors, edgecolor='white', linewidth=0.5)
     
     ax.set_yticks(y_pos)
     ax.set_yticklabels(labels)
@@ -292,8 +403,7 @@ def plot_horizontal_bar_chart(data: Dict[str, float],
     ax.set_title(title)
     
     # Add value labels
-    for i, v in enumerate(values):
-        ax.text(v + 0.01, i, f'{v:.2f}', va='center', fontsize=9)
+    ax.bar_label(bars, fmt='%.2f', padding=3, fontsize=9)
     
     ax.invert_yaxis()  # Highest values at top
     
@@ -322,13 +432,18 @@ def plot_stacked_area(df, x_col: str, value_cols: List[str],
     Returns:
         Matplotlib axes
     """
+    setup_style()
+    
     if ax is None:
         fig, ax = create_figure('double')
     
     x = df[x_col]
-    y_stack = [df[col].values for col in value_cols]
+    y_stack = np.ascontiguousarray(df[value_cols].to_numpy(dtype=np.float64).T)
     
-    ax.stackplot(x, *y_stack, labels=value_cols, colors=colors, alpha=0.8)
+    polys = ax.stackplot(x, y_stack, labels=value_cols, colors=colors, alpha=0.8)
+    if len(df) > RASTERIZE_MIN_POINTS:
+        for poly in polys:
+            poly.set_rasterized(True)
     
     ax.set_xlabel(xlabel)
     ax.set_ylabel(ylabel)
@@ -339,52 +454,94 @@ def plot_stacked_area(df, x_col: str, value_cols: List[str],
     return ax
 
 
+def _spring_layout_has_energy() -> bool:
+    """Whether nx.spring_layout supports method='energy' (NetworkX >= 3.5)."""
+    try:
+        import networkx as nx
+    except ImportError:
+        return False
+    return 'method' in inspect.signature(nx.spring_layout).parameters
+
+
+_SPRING_ENERGY = _spring_layout_has_energy()
+
+
 def plot_network_graph(G, 
                         node_colors: Dict[str, str],
                         node_sizes: Dict[str, float],
                         title: str,
-                        layout: str = 'spring',
-                        ax: Optional[plt.Axes] = None) -> plt.Axes:
+                        layout: str = 'auto',
+                        ax: Optional[plt.Axes] = None,
+                        pos: Optional[Dict[str, Tuple[float, float]]] = None,
+                        label_threshold: Optional[float] = None) -> plt.Axes:
     """
     Plot a network graph with customized styling.
     
+    To redraw the same graph with different overlays without recomputing
+    the layout, compute positions once and pass them as ``pos``.
+    
     Args:
         G: NetworkX graph
         node_colors: Mapping of node names to colors
         node_sizes: Mapping of node names to sizes
         title: Chart title
-        layout: Layout algorithm ('spring', 'kamada_kawai', 'circular')
+        layout: Layout algorithm ('auto', 'spring', 'energy', 'kamada_kawai',
+            'circular'); 'auto' uses 'circular' for edgeless graphs and graphs
+            with fewer than SMALL_GRAPH_NODES nodes, and 'spring' otherwise. 'energy'
+            minimizes the spring energy with L-BFGS (NetworkX >= 3.5 with
+            SciPy) and otherwise falls back to 'spring'
         ax: Optional axes to plot on
+        pos: Optional precomputed node positions (e.g. from a previous
+            nx.spring_layout call); overrides ``layout``
+        label_threshold: Only label nodes whose size is at least this value
+            (None labels every node)
         
     Returns:
         Matplotlib axes
     """
     import networkx as nx
     
+    setup_style()
+    
     if ax is None:
         fig, ax = create_figure('square')
     
     # Compute layout
-    if layout == 'spring':
-        pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
-    elif layout == 'kamada_kawai':
-        pos = nx.kamada_kawai_layout(G)
-    else:
-        pos = nx.circular_layout(G)
+    if pos is None:
+        if layout == 'auto':
+            small = len(G) < SMALL_GRAPH_NODES or G.number_of_edges() == 0
+            layout = 'circular' if small else 'spring'
+        if layout == 'energy' and _SPRING_ENERGY:
+            try:
+                pos = nx.spring_layout(G, k=2, iterations=50, seed=42, method='energy')
+            except ImportError:  # SciPy missing
+                pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
+        elif layout in ('spring', 'energy'):
+            pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
+        elif layout == 'kamada_kawai':
+            pos = nx.kamada_kawai_layout(G)
+        else:
+            pos = nx.circular_layout(G)
     
     # Prepare node attributes
     colors = [node_colors.get(n, COLORS['mixed']) for n in G.nodes()]
     sizes = [node_sizes.get(n, 300) for n in G.nodes()]
     
-    # Draw edges
-    edge_weights = [G[u][v].get('weight', 1) for u, v in G.edges()]
-    max_weight = max(edge_weights) if edge_weights else 1
-    edge_widths = [2 * w / max_weight for w in edge_weights]
-    
-    nx.draw_networkx_edges(G, pos, ax=ax, 
-                           width=edge_widths, 
-                           alpha=0.5, 
-                           edge_color='gray')
+    # Draw edges (edgeless graphs skip straight to the nodes)
+    if G.number_of_edges():
+        edge_weights = np.fromiter((d.get('weight', 1) for _, _, d in G.edges(data=True)),
+                                   dtype=np.float64, count=G.number_of_edges())
+        edge_widths = (2 * edge_weights / edge_weights.max()).tolist()
+        
+        edges = nx.draw_networkx_edges(G, pos, ax=ax,
+                                       width=edge_widths,
+                                       alpha=0.5,
+                                       edge_color='gray')
+        # Undirected edges come back as one LineCollection; large graphs
+        # rasterize it in vector output (nodes and labels stay vector).
+        # Directed graphs return arrow patches, which cannot be rasterized.
+        if not isinstance(edges, list):
+            edges.set_rasterized(G.number_of_nodes() > RASTERIZE_MIN_NODES)
     
     # Draw nodes
     nx.draw_networkx_nodes(G, pos, ax=ax,
@@ -394,10 +551,12 @@ def plot_network_graph(G,
                            edgecolors='white',
                            linewidths=2)
     
-    # Draw labels
-    nx.draw_networkx_labels(G, pos, ax=ax,
-                            font_size=9,
-                            font_weight='bold')
+    # Draw labels (only for nodes at or above the size threshold)
+    for n, size in zip(G.nodes(), sizes):
+        if label_threshold is None or size >= label_threshold:
+            x, y = pos[n]
+            ax.text(x, y, str(n), size=9, weight='bold', family='sans-serif', color='k',
+                    ha='center', va='center', clip_on=True)
     
     ax.set_title(title)
     ax.axis('off')
@@ -405,15 +564,43 @@ def plot_network_graph(G,
     return ax
 
 
+def _block_mean(data: np.ndarray, max_rows: int, max_cols: int) -> np.ndarray:
+    """
+    Shrink a 2D array to at most (max_rows, max_cols) by averaging blocks.
+    
+    Args:
+        data: 2D numpy array of values
+        max_rows: Row budget
+        max_cols: Column budget
+        
+    Returns:
+        Block-averaged array (the last block along an axis may be smaller)
+    """
+    for axis, budget in ((0, max_rows), (1, max_cols)):
+        n = data.shape[axis]
+        if n > budget:
+            starts = np.arange(0, n, -(-n // budget))
+            counts = np.diff(np.append(starts, n))
+            sums = np.add.reduceat(data, starts, axis=axis)
+            data = sums / (counts[:, None] if axis == 0 else counts)
+    return data
+
+
 def create_heatmap(data: np.ndarray,
                    row_labels: List[str],
                    col_labels: List[str],
                    title: str,
                    cmap: str = 'YlOrRd',
-                   ax: Optional[plt.Axes] = None) -> plt.Axes:
+                   ax: Optional[plt.Axes] = None,
+                   max_pixels: Optional[int] = None,
+                   colorbar: bool = True,
+                   cbar_ax: Optional[plt.Axes] = None) -> plt.Axes:
     """
     Create a heatmap visualization.
     
+    With ``max_pixels`` set, larger arrays are block-averaged before
+    drawing; ticks still refer to the original rows and columns.
+    
     Args:
         data: 2D numpy array of values
         row_labels: Labels for rows
@@ -421,24 +608,42 @@ def create_heatmap(data: np.ndarray,
         title: Chart title
         cmap: Colormap name
         ax: Optional axes to plot on
+        max_pixels: Optional cell budget per axis; larger arrays are
+            block-averaged down to it (which also averages away outlier
+            cells). None (default) draws every cell
+        colorbar: Whether to attach a colorbar
+        cbar_ax: Optional existing axes to draw the colorbar into, e.g. one
+            shared by a grid of heatmaps on the same scale (skips the layout
+            work of carving a new colorbar axes out of ``ax``)
         
     Returns:
         Matplotlib axes
     """
+    setup_style()
+    
     if ax is None:
         fig, ax = create_figure('square')
     
-    im = ax.imshow(data, cmap=cmap, aspect='auto')
+    data = np.asarray(data)
+    n_rows, n_cols = data.shape
+    if max_pixels is not None and max(n_rows, n_cols) > max_pixels:
+        data = _block_mean(data.astype(np.float64), max_pixels, max_pixels)
     
-    ax.set_xticks(np.arange(len(col_labels)))
-    ax.set_yticks(np.arange(len(row_labels)))
-    ax.set_xticklabels(col_labels, rotation=45, ha='right')
-    ax.set_yticklabels(row_labels)
+    # extent keeps the original cell coordinates for ticks
+    im = ax.imshow(data, cmap=cmap, aspect='auto', interpolation='nearest',
+                   extent=(-0.5, n_cols - 0.5, n_rows - 0.5, -0.5))
+    
+    # Ticks and labels in one call per axis
+    ax.set_xticks(np.arange(len(col_labels)), labels=col_labels, rotation=45, ha='right')
+    ax.set_yticks(np.arange(len(row_labels)), labels=row_labels)
     
     ax.set_title(title)
     
     # Add colorbar
-    plt.colorbar(im, ax=ax, shrink=0.8)
+    if cbar_ax is not None:
+        ax.figure.colorbar(im, cax=cbar_ax)
+    elif colorbar:
+        plt.colorbar(im, ax=ax, shrink=0.8)
     
     return ax
 
@@ -453,12 +658,7 @@ def get_classification_color(classification: str) -> str:
     Returns:
         Color hex code
     """
-    mapping = {
-        'Story-Heavy': COLORS['story'],
-        'Mixed': COLORS['mixed'],
-        'Combat/Traversal': COLORS['combat'],
-    }
-    return mapping.get(classification, COLORS['mixed'])
+    return CLASSIFICATION_COLORS.get(classification, COLORS['mixed'])
 
 
 def get_context_color(context: str) -> str:
@@ -484,35 +684,52 @@ def get_community_color(community_id: int) -> str:
     Returns:
         Color hex code
     """
-    community_colors = [
-        COLORS['community_1'],
-        COLORS['community_2'],
-        COLORS['community_3'],
-        COLORS['community_4'],
-        COLORS['community_5'],
-    ]
-    return community_colors[community_id % len(community_colors)]
+    return COMMUNITY_COLORS[community_id % len(COMMUNITY_COLORS)]
 
 
 # ============================================================================
 # TABLE GENERATION
 # ============================================================================
 
-def save_table_markdown(df, filepath: str, title: Optional[str] = None) -> str:
+def _submit_io(fn, *args) -> Future:
     """
-    Save DataFrame as markdown table.
+    Run a file write on the background I/O pool.
+    
+    The pool is created on first use and drained at interpreter exit.
     
     Args:
-        df: DataFrame to save
-        filepath: Output path
-        title: Optional table title
+        fn: Write function
+        *args: Arguments for fn
         
     Returns:
-        Path to saved file
+        Future resolving to fn's return value
     """
-    filepath = Path(filepath)
-    filepath.parent.mkdir(parents=True, exist_ok=True)
+    global _IO_POOL
+    if _IO_POOL is None:
+        _IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix='table-io')
+        atexit.register(flush_pending_io)
+    future = _IO_POOL.submit(fn, *args)
+    _PENDING_IO.append(future)
+    return future
+
+
+def flush_pending_io() -> List[str]:
+    """
+    Wait for all background table writes started with async_io=True.
     
+    Returns:
+        Paths of the files written since the last flush
+        
+    Raises:
+        Exception: The first error raised by a pending write
+    """
+    pending = list(_PENDING_IO)
+    _PENDING_IO.clear()
+    return [future.result() for future in pending]
+
+
+def _write_table_markdown(df, filepath: Path, title: Optional[str]) -> str:
+    """Write df to filepath as a markdown table (see save_table_markdown)."""
     with open(filepath, 'w', encoding='utf-8') as f:
         if title:
             f.write(f'# {title}\n\n')
@@ -522,25 +739,70 @@ def save_table_markdown(df, filepath: str, title: Optional[str] = None) -> str:
     return str(filepath)
 
 
-def save_table_csv(df, filepath: str) -> str:
+def _write_table_csv(df, filepath: Path, engine: str) -> str:
+    """Write df to filepath as CSV (see save_table_csv)."""
+    if engine == 'pyarrow':
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pacsv.write_csv(table, str(filepath),
+                        write_options=pacsv.WriteOptions(quoting_style='needed'))
+    else:
+        df.to_csv(filepath, index=False, encoding='utf-8')
+    
+    return str(filepath)
+
+
+def save_table_markdown(df, filepath: str, title: Optional[str] = None,
+                        async_io: bool = False) -> Union[str, Future]:
     """
-    Save DataFrame as CSV.
+    Save DataFrame as markdown table.
     
     Args:
         df: DataFrame to save
         filepath: Output path
+        title: Optional table title
+        async_io: Write a copy of df on a background thread and return at
+            once; call flush_pending_io() to wait for the file
         
     Returns:
-        Path to saved file
+        Path to saved file, or a Future resolving to it when async_io is set
     """
     filepath = Path(filepath)
     filepath.parent.mkdir(parents=True, exist_ok=True)
     
-    df.to_csv(filepath, index=False, encoding='utf-8')
-    
-    return str(filepath)
+    if async_io:
+        return _submit_io(_write_table_markdown, df.copy(), filepath, title)
+    return _write_table_markdown(df, filepath, title)
 
 
-# Initialize style on import
-_font = setup_style()
-print(f"Visualization module loaded. Using font: {_font}")
+def save_table_csv(df, filepath: str, async_io: bool = False,
+                   engine: str = 'pandas') -> Union[str, Future]:
+    """
+    Save DataFrame as CSV.
+    
+    Args:
+        df: DataFrame to save
+        filepath: Output path
+        async_io: Write a copy of df on a background thread and return at
+            once; call flush_pending_io() to wait for the file
+        engine: 'pandas' (default) or 'pyarrow' for pyarrow's multi-threaded
+            writer on long tables; its output quotes every string, writes
+            booleans as true/false and never uses exponent notation
+        
+    Returns:
+        Path to saved file, or a Future resolving to it when async_io is set
+        
+    Raises:
+        ImportError: If engine='pyarrow' and pyarrow is not installed
+        ValueError: If engine is not 'pandas' or 'pyarrow'
+    """
+    if engine not in ('pandas', 'pyarrow'):
+        raise ValueError(f"Unknown CSV engine: {engine!r}")
+    if engine == 'pyarrow' and pa is None:
+        raise ImportError("engine='pyarrow' requires the pyarrow package")
+    
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    
+    if async_io:
+        return _submit_io(_write_table_csv, df.copy(), filepath, engine)
+    return _write_table_csv(df, filepath, engine)